@@ -16,7 +16,7 @@ async def basic_retry_example():
     """Basic example with default retry behavior."""
     print("=== Basic Retry Example ===")
     async with Fetcher() as f:
-        # Default: retries on {429, 500, 502, 503, 504} with exponential backoff
+        # Default: retries on {429, 500, 502, 503, 504} with jittered backoff
         resp = await f.fetch("https://httpbin.org/status/503")
         print(f"Status: {resp.status}, Error: {resp.error}")
 
@@ -38,8 +38,8 @@ async def faster_backoff():
     """Use faster backoff for time-sensitive requests."""
     print("\n=== Faster Backoff ===")
     async with Fetcher() as f:
-        # Faster backoff: 1.5^attempt instead of 2^attempt
-        # Attempt 0: ~0.75-1.5s, Attempt 1: ~1.125-2.25s
+        # Faster backoff: each delay is drawn from [base, previous * 3]
+        # Attempt 0: ~1.5-4.5s, later attempts grow from there (capped at 30s)
         resp = await f.fetch(
             "https://httpbin.org/delay/5",
             max_retries=2,
@@ -58,7 +58,7 @@ async def aggressive_retry():
             "https://httpbin.org/status/503",
             max_retries=10,
             retry_on={429, 500, 502, 503, 504},
-            retry_backoff=1.2,  # Slower backoff to be gentle
+            retry_backoff=1.2,  # Shorter minimum delay between retries
             timeout=5.0,
         )
         print(
@@ -1,17 +1,111 @@
-import base64
-import hashlib
-import json
+import asyncio
 import time
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Protocol
 
+import ahocorasick
+import msgspec
+import xxhash
+import zstandard
 from loguru import logger
 
-from .telemetry import get_tracer
-from .types import CacheStrategy, Response
+from .telemetry import get_tracer, start_span
+from .types import CacheStrategy, EngineType, Response
 
 tracer = get_tracer()
 
+# Bodies below this size are stored uncompressed
+ZSTD_MIN_SIZE = 4096
+
+
+class _CacheEntry(msgspec.Struct, array_like=True, gc=False):
+    """On-disk cache record, msgpack encoded."""
+
+    timestamp: float
+    url: str
+    resource_type: str
+    response_url: str
+    status: int
+    body: bytes
+    body_compressed: bool = False
+    headers: dict[str, str] = {}
+    engine: EngineType = "curl"
+    elapsed: float = 0.0
+    proxy_used: str | None = None
+    error: str | None = None
+
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(_CacheEntry)
+_compressor = zstandard.ZstdCompressor(level=1)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _write_batch(batch: dict[Path, bytes]) -> None:
+    for path, data in batch.items():
+        try:
+            path.write_bytes(data)
+        except Exception as e:
+            logger.warning(f"[cache] Failed to write cache file {path}: {e}")
+
+
+class _WriteQueue:
+    """
+    Coalesces concurrent cache writes into batches written from a worker thread.
+
+    A batch is flushed after `delay` seconds or once `max_batch` entries are
+    pending, so a page with hundreds of sub-resources costs a handful of
+    thread hops instead of one blocking write per resource. put() returns
+    once its batch is on disk.
+    """
+
+    def __init__(self, max_batch: int = 256, delay: float = 0.005):
+        self.max_batch = max_batch
+        self.delay = delay
+        self._pending: dict[Path, bytes] = {}
+        self._pending_done: asyncio.Future[None] | None = None
+        self._inflight: list[dict[Path, bytes]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def lookup(self, path: Path) -> bytes | None:
+        """Return data queued for `path` that may not be on disk yet."""
+        if path in self._pending:
+            return self._pending[path]
+        for batch in reversed(self._inflight):
+            if path in batch:
+                return batch[path]
+        return None
+
+    async def put(self, path: Path, data: bytes) -> None:
+        """Queue `data` for `path` and wait until its batch has been written."""
+        self._pending[path] = data
+        done = self._pending_done
+        if done is None:
+            done = self._pending_done = asyncio.get_running_loop().create_future()
+            self._flush_task = asyncio.create_task(self._flush_later())
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        await asyncio.shield(done)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending entries to disk."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        done, self._pending_done = self._pending_done, None
+        self._inflight.append(batch)
+        try:
+            await asyncio.to_thread(_write_batch, batch)
+        finally:
+            self._inflight.remove(batch)
+            if done is not None and not done.done():
+                done.set_result(None)
+
 
 class Cache(Protocol):
     async def get(self, key: str) -> Response | None: ...
@@ -25,11 +119,21 @@ class Cache(Protocol):
 
 class FileSystemCache:
     def __init__(
-        self, cache_dir: str | Path = ".cache", strategy: CacheStrategy = "resources"
+        self,
+        cache_dir: str | Path = ".cache",
+        strategy: CacheStrategy = "resources",
     ):
+        """
+        Args:
+            cache_dir: Directory to store cache entries in
+            strategy: Which resource types to cache
+        """
+        # Created on first write, together with the shard directory
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.strategy = strategy
+        self._writes = _WriteQueue()
+        # Shard directories known to exist
+        self._shards: set[Path] = set()
 
         # Different TTLs for different resource types (in seconds)
         self.ttl_map = {
@@ -71,8 +175,6 @@ class FileSystemCache:
             "conservative": {"image", "font", "media"},
         }
 
-        # Tracking/analytics domains to block completely
-
         # Tracking/analytics domains to block completely
         self.blocked_domains = {
             "fls-na.amazon.com",
@@ -99,9 +201,42 @@ class FileSystemCache:
             "yahoo.com/cms",
         }
 
+    @property
+    def blocked_domains(self) -> frozenset[str]:
+        """
+        Tracking/analytics domains to block completely.
+
+        Assign a new collection, or use block_domain()/unblock_domain(), to
+        change it; either rebuilds the matcher used by should_block().
+        """
+        return self._blocked_domains
+
+    @blocked_domains.setter
+    def blocked_domains(self, domains: Iterable[str]) -> None:
+        self._blocked_domains = frozenset(domains)
+        self._build_blocker()
+
+    def block_domain(self, domain: str) -> None:
+        """Add a domain to blocked_domains."""
+        self.blocked_domains = self._blocked_domains | {domain}
+
+    def unblock_domain(self, domain: str) -> None:
+        """Remove a domain from blocked_domains, if present."""
+        self.blocked_domains = self._blocked_domains - {domain}
+
+    def _build_blocker(self) -> None:
+        """Compile blocked_domains into an Aho-Corasick automaton."""
+        self._blocker = ahocorasick.Automaton()
+        for domain in self._blocked_domains:
+            self._blocker.add_word(domain, domain)
+        if self._blocked_domains:
+            self._blocker.make_automaton()
+
     def should_block(self, url: str) -> bool:
         """Check if URL should be blocked entirely"""
-        return any(domain in url for domain in self.blocked_domains)
+        if not self._blocked_domains:
+            return False
+        return next(self._blocker.iter(url), None) is not None
 
     def should_cache_request(self, resource_type: str) -> bool:
         """Check if resource type should be cached based on strategy."""
@@ -115,7 +250,16 @@ class FileSystemCache:
 
     def get_cache_key(self, url: str) -> str:
         """Generate a cache key from the URL."""
-        return hashlib.md5(url.encode()).hexdigest()
+        return xxhash.xxh128_hexdigest(url.encode())
+
+    def get_entry_path(self, file_key: str) -> Path:
+        """
+        Path of the entry for a cache key.
+
+        Entries are sharded two levels deep by key prefix (ab/cd/abcd...) so no
+        single directory grows large enough to slow down lookups.
+        """
+        return self.cache_dir / file_key[:2] / file_key[2:4] / f"{file_key}.msgpack"
 
     def get_ttl(self, resource_type: str) -> int:
         """Get TTL in seconds for a resource type."""
@@ -131,7 +275,7 @@ class FileSystemCache:
         Returns:
             Response object if found and not expired, else None
         """
-        with tracer.start_as_current_span("phantomfetch.cache.get") as span:
+        with start_span(tracer, "phantomfetch.cache.get") as span:
             span.set_attribute("phantomfetch.cache.key", key)
 
             # Key is expected to be the URL or a composite key
@@ -148,24 +292,26 @@ class FileSystemCache:
             else:
                 url = key
 
-            file_key = self.get_cache_key(url)
-            file_path = self.cache_dir / f"{file_key}.json"
+            file_path = self.get_entry_path(self.get_cache_key(url))
 
-            if not file_path.exists():
+            # Entries set moments ago may still be queued for writing
+            data = self._writes.lookup(file_path)
+            if data is None and not file_path.exists():
                 span.set_attribute("phantomfetch.cache.hit", False)
                 return None
 
             try:
-                with open(file_path) as f:
-                    data = json.load(f)
+                if data is None:
+                    data = file_path.read_bytes()
+                entry = _decoder.decode(data)
 
-                resource_type = data.get("resourceType", "other")
+                resource_type = entry.resource_type
                 ttl = self.get_ttl(resource_type)
 
-                if time.time() - data["timestamp"] < ttl:
-                    resp_data = data["response"]
-                    # Decode body
-                    body_bytes = base64.b64decode(resp_data["body"])
+                if time.time() - entry.timestamp < ttl:
+                    body_bytes = entry.body
+                    if entry.body_compressed:
+                        body_bytes = _decompressor.decompress(body_bytes)
 
                     # Reconstruct Response object
                     span.set_attribute("phantomfetch.cache.hit", True)
@@ -175,17 +321,16 @@ class FileSystemCache:
                     )
 
                     return Response(
-                        url=resp_data["url"],
-                        status=resp_data["status"],
+                        url=entry.response_url,
+                        status=entry.status,
                         body=body_bytes,
-                        headers=resp_data.get("headers", {}),
-                        engine=resp_data.get("engine", "curl"),
-                        elapsed=resp_data.get("elapsed", 0.0),
-                        proxy_used=resp_data.get("proxy_used"),
-                        error=resp_data.get("error"),
-                        # We don't cache screenshot/action_results in this JSON format yet
-                        # unless we extend the user's schema.
-                        # For now, let's assume basic response caching.
+                        headers=entry.headers,
+                        engine=entry.engine,
+                        elapsed=entry.elapsed,
+                        proxy_used=entry.proxy_used,
+                        error=entry.error,
+                        # Screenshots/action_results are not cached,
+                        # only the basic response.
                     )
                 else:
                     # Expired
@@ -204,6 +349,9 @@ class FileSystemCache:
         """
         Save a response to the cache.
 
+        Concurrent calls are written to disk together in one batch; each call
+        returns once its entry has been written.
+
         Args:
             key: Cache key (usually the URL)
             response: Response object to cache
@@ -217,45 +365,49 @@ class FileSystemCache:
         if self.should_block(url):
             return
 
-        file_key = self.get_cache_key(url)
-        file_path = self.cache_dir / f"{file_key}.json"
-
-        # Prepare data
-        resp_dict = {
-            "url": response.url,
-            "status": response.status,
-            "body": base64.b64encode(response.body).decode(),
-            "headers": response.headers,
-            "engine": response.engine,
-            "elapsed": response.elapsed,
-            "proxy_used": response.proxy_used,
-            "error": response.error,
-        }
-
-        data = {
-            "timestamp": time.time(),
-            "response": resp_dict,
-            "url": url,
-            "resourceType": "other",  # Default for now
-        }
-
-        try:
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.warning(f"[cache] Failed to write cache for {key}: {e}")
+        file_path = self.get_entry_path(self.get_cache_key(url))
+        if file_path.parent not in self._shards:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._shards.add(file_path.parent)
+
+        body = response.body
+        compressed = len(body) >= ZSTD_MIN_SIZE
+        if compressed:
+            body = _compressor.compress(body)
+
+        entry = _CacheEntry(
+            timestamp=time.time(),
+            url=url,
+            resource_type="other",  # Default for now
+            response_url=response.url,
+            status=response.status,
+            body=body,
+            body_compressed=compressed,
+            headers=response.headers,
+            engine=response.engine,
+            elapsed=response.elapsed,
+            proxy_used=response.proxy_used,
+            error=response.error,
+        )
+
+        await self._writes.put(file_path, _encoder.encode(entry))
+
+    async def flush(self) -> None:
+        """Write any queued entries to disk."""
+        await self._writes.flush()
 
     def clear_expired(self) -> None:
         """Remove expired entries from the cache."""
+        # Entries written before the msgpack format can no longer be read
         for file_path in self.cache_dir.glob("*.json"):
-            try:
-                with open(file_path) as f:
-                    data = json.load(f)
+            file_path.unlink(missing_ok=True)
 
-                resource_type = data.get("resourceType", "other")
-                ttl = self.get_ttl(resource_type)
+        for file_path in self.cache_dir.glob("*/*/*.msgpack"):
+            try:
+                entry = _decoder.decode(file_path.read_bytes())
+                ttl = self.get_ttl(entry.resource_type)
 
-                if time.time() - data["timestamp"] >= ttl:
+                if time.time() - entry.timestamp >= ttl:
                     file_path.unlink()
             except Exception:
                 file_path.unlink(missing_ok=True)
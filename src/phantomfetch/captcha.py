@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING, Protocol
 
 import httpx
@@ -44,6 +45,27 @@ class TwoCaptchaSolver:
     API_URL = "http://2captcha.com/in.php"
     RES_URL = "http://2captcha.com/res.php"
 
+    POLL_TIMEOUT = 150.0
+    MIN_POLL_INTERVAL = 1.0
+    MAX_POLL_INTERVAL = 20.0
+
+    # Moving average of observed solve times in seconds, shared across
+    # instances since a new solver is created for every action.
+    _expected_solve_s: float = 8.0
+
+    @classmethod
+    def _poll_interval(cls) -> float:
+        """Delay between result polls: a quarter of the expected solve time."""
+        return min(
+            cls.MAX_POLL_INTERVAL,
+            max(cls.MIN_POLL_INTERVAL, cls._expected_solve_s / 4),
+        )
+
+    @classmethod
+    def _record_solve(cls, elapsed: float) -> None:
+        """Fold a successful solve time into the moving average."""
+        cls._expected_solve_s = 0.8 * cls._expected_solve_s + 0.2 * elapsed
+
     async def solve(self, page: "Page", action: "Action") -> str | None:
         if not action.api_key:
             logger.error("[captcha] No API key provided for 2Captcha")
@@ -89,8 +111,9 @@ class TwoCaptchaSolver:
                 request_id = data["request"]
 
                 # 2. Poll for result
-                for _ in range(30):  # Wait up to 150s
-                    await asyncio.sleep(5)
+                submitted = time.monotonic()
+                while time.monotonic() - submitted < self.POLL_TIMEOUT:
+                    await asyncio.sleep(self._poll_interval())
                     resp = await client.get(
                         self.RES_URL,
                         params={
@@ -104,6 +127,7 @@ class TwoCaptchaSolver:
 
                     if data.get("status") == 1:
                         token = data["request"]
+                        self._record_solve(time.monotonic() - submitted)
                         logger.info("[captcha] Solved successfully")
                         await self._inject_token(page, token, captcha_type)
 
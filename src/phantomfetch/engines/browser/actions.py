@@ -2,14 +2,15 @@ import asyncio
 import logging
 import random
 import time
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
-if TYPE_CHECKING:
-    from rebrowser_playwright.async_api import Locator, Page
+from rebrowser_playwright.async_api import Locator, Page
 
+if TYPE_CHECKING:
     from ...types import ActionResult
 
-from ...telemetry import get_tracer
+from ...telemetry import get_tracer, start_span
 from ...types import Action
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,22 @@ async def _human_mouse_move(page: "Page", element_handle: Any):
     # We can add a slight overshoot/correction if we want to be fancy, but `steps` is 1st iterated humanization.
 
 
+ActionHandler = Callable[["Page | Locator", Action, "ActionResult"], Awaitable[None]]
+
+# Action type -> handler, populated by @_register
+_DISPATCH: dict[str, ActionHandler] = {}
+
+
+def _register(name: str) -> Callable[[ActionHandler], ActionHandler]:
+    """Register the decorated coroutine as the handler for an action type."""
+
+    def decorator(handler: ActionHandler) -> ActionHandler:
+        _DISPATCH[name] = handler
+        return handler
+
+    return decorator
+
+
 async def execute_actions(
     page: "Page | Locator", actions: list[Action]
 ) -> list["ActionResult"]:
@@ -71,16 +88,14 @@ async def execute_actions(
     Returns:
         List of ActionResult objects
     """
-    from rebrowser_playwright.async_api import Page
-
     from ...types import ActionResult
 
     results = []
+    # Locators for if_selector checks, reused when several actions share a condition
+    condition_locators: dict[str, Locator] = {}
 
     for action in actions:
-        with tracer.start_as_current_span(
-            f"phantomfetch.action.{action.action}"
-        ) as span:
+        with start_span(tracer, f"phantomfetch.action.{action.action}") as span:
             span.set_attribute("phantomfetch.action.type", action.action)
             if action.selector:
                 span.set_attribute("phantomfetch.action.selector", action.selector)
@@ -97,6 +112,10 @@ async def execute_actions(
                 # If page is Locator, we check inside it?
                 # Playwright Locator doesn't have wait_for_selector directly with same API sometimes?
                 # Actually locator.locator(selector).count() works.
+                target = condition_locators.get(action.if_selector)
+                if target is None:
+                    target = page.locator(action.if_selector)
+                    condition_locators[action.if_selector] = target
 
                 # If timeout is specified, wait for selector
                 if action.if_selector_timeout > 0:
@@ -104,12 +123,6 @@ async def execute_actions(
                         logger.debug(
                             f"[browser] Waiting up to {action.if_selector_timeout}ms for condition: {action.if_selector}"
                         )
-                        # wait_for_selector is available on Page, frame, and ElementHandle.
-                        # Locator has specific methods.
-                        # We can use page.locator(selector).wait_for(...)
-                        # But wait_for_selector is convenient.
-                        # If page is Locator, creating a sub-locator:
-                        target = page.locator(action.if_selector)
                         await target.wait_for(
                             timeout=action.if_selector_timeout,
                             state="attached",
@@ -119,7 +132,7 @@ async def execute_actions(
                         condition_met = False
                 else:
                     # Immediate check
-                    condition_count = await page.locator(action.if_selector).count()
+                    condition_count = await target.count()
                     condition_met = condition_count > 0
 
                 if not condition_met:
@@ -148,486 +161,14 @@ async def execute_actions(
             result = ActionResult(action=action, success=True)
 
             try:
-                match action.action:
-                    case "wait":
-                        if action.selector:
-                            state = action.state or "visible"
-                            if isinstance(ctx, Page):
-                                await ctx.wait_for_selector(
-                                    action.selector,
-                                    timeout=action.timeout,
-                                    state=state,
-                                )
-                            else:
-                                # Start from locator context
-                                await ctx.locator(action.selector).first.wait_for(
-                                    timeout=action.timeout, state=state
-                                )
-                        elif action.timeout:
-                            target_page = ctx if isinstance(ctx, Page) else ctx.page
-                            await target_page.wait_for_timeout(action.timeout)
-
-                    case "loop":
-                        if not action.selector or not action.actions:
-                            result.success = False
-                            result.error = "Loop requires selector and child actions"
-                        else:
-                            # 1. Find all elements on the resolved context
-                            elements = await ctx.locator(action.selector).all()
-                            loop_results = []
-
-                            limit = action.max_iterations or 100
-                            logger.debug(
-                                f"[browser] Looping over {len(elements)} elements (limit={limit})"
-                            )
-
-                            for i, el in enumerate(elements):
-                                if i >= limit:
-                                    break
-                                # 2. Execute child actions on EACH element locator
-                                sub_res = await execute_actions(el, action.actions)
-                                loop_results.append({"index": i, "results": sub_res})
-
-                            result.data = loop_results
-
-                    case "click":
-                        if action.selector:
-                            if action.human_like:
-                                # Human-like click
-                                # Resolve handle first
-                                if isinstance(ctx, Page):
-                                    handle = await ctx.wait_for_selector(
-                                        action.selector,
-                                        timeout=action.timeout,
-                                        state="visible",
-                                    )
-                                else:
-                                    # Locator context
-                                    target = ctx.locator(action.selector).first
-                                    await target.wait_for(
-                                        timeout=action.timeout, state="visible"
-                                    )
-                                    handle = await target.element_handle()
-
-                                if handle:
-                                    # Need page for mouse move
-                                    target_page = (
-                                        ctx if isinstance(ctx, Page) else ctx.page
-                                    )
-                                    await _human_mouse_move(target_page, handle)
-                                    await handle.click(delay=random.randint(50, 150))
-                            else:
-                                await ctx.click(
-                                    action.selector,
-                                    timeout=action.timeout,
-                                )
-                        # Context click (no selector)
-                        elif isinstance(ctx, Page):
-                            result.success = False
-                            result.error = "Click action on Page requires a selector"
-                        elif action.human_like:
-                            # Human-like click on self (ctx is locator)
-                            handle = await ctx.element_handle()
-                            if handle:
-                                target_page = ctx.page
-                                await _human_mouse_move(target_page, handle)
-                                await handle.click(delay=random.randint(50, 150))
-                        else:
-                            await ctx.click(timeout=action.timeout)
-
-                    case "input":
-                        if action.selector:
-                            # Input into descendant
-                            val_str = str(action.value)
-                            if action.human_like:
-                                await ctx.click(action.selector, timeout=action.timeout)
-                                target_page = ctx if isinstance(ctx, Page) else ctx.page
-                                await _human_type(target_page, val_str)
-                            else:
-                                await ctx.fill(
-                                    action.selector,
-                                    val_str,
-                                    timeout=action.timeout,
-                                )
-                        # Input into self (ctx is locator)
-                        elif isinstance(ctx, Page):
-                            result.success = False
-                            result.error = "Input action on Page requires a selector"
-                        else:
-                            val_str = str(action.value)
-                            if action.human_like:
-                                await ctx.click(timeout=action.timeout)
-                                target_page = ctx.page
-                                await _human_type(target_page, val_str)
-                            else:
-                                await ctx.fill(val_str, timeout=action.timeout)
-
-                    case "scroll":
-                        # Scroll usually implies page-level or element-level scroll
-                        # For now, keep page level logic mostly
-                        target_page = ctx if isinstance(ctx, Page) else ctx.page
-
-                        if action.selector == "top":
-                            await target_page.evaluate("window.scrollTo(0, 0)")
-                        elif action.x is not None or action.y is not None:
-                            x = action.x or 0
-                            y = action.y or 0
-                            await target_page.evaluate(f"window.scrollTo({x}, {y})")
-                        elif action.selector:
-                            # Scroll specific element into view
-                            await ctx.locator(
-                                action.selector
-                            ).scroll_into_view_if_needed(timeout=action.timeout)
-                        else:
-                            await target_page.evaluate(
-                                "window.scrollTo(0, document.body.scrollHeight)"
-                            )
-
-                    case "extract":
-                        # Validate schema
-                        if not action.schema:
-                            result.error = "Extraction requires a schema"
-                            result.success = False
-                        else:
-                            # Compatibility JS for Locator execution
-                            # RE-WRITING JS FOR LOCATOR COMPATIBILITY
-
-                            js_extract_compat = """
-                            (nodeOrArgs, argsIfNode) => {
-                                // Logic to detect if called on element or page
-                                let ctx = document;
-                                let args = nodeOrArgs;
-
-                                if (nodeOrArgs instanceof Node) {
-                                    ctx = nodeOrArgs;
-                                    args = argsIfNode;
-                                }
-
-                                const { rootSelector, schema } = args;
-
-                                const getEl = (c, s) => s ? c.querySelector(s) : c;
-
-                                const isVisible = (el) => {
-                                    if (!el) return false;
-                                    return el.offsetParent !== null && window.getComputedStyle(el).display !== 'none' && window.getComputedStyle(el).visibility !== 'hidden';
-                                };
-
-                                const extractSingle = (c, spec) => {
-                                    let selector = spec;
-                                    let op = "text";
-                                    let param = null;
-                                    let visibleOnly = false;
-
-                                    if (typeof spec === "object" && spec !== null && spec._selector) {
-                                        selector = spec._selector;
-                                        visibleOnly = !!spec._visible_only;
-                                    } else if (typeof spec === "string") {
-                                        if (spec.includes(" :: ")) {
-                                            const parts = spec.split(" :: ");
-                                            selector = parts[0];
-                                            const opPart = parts[1];
-                                            if (opPart.startsWith("attr(")) {
-                                                op = "attr";
-                                                param = opPart.slice(5, -1);
-                                            } else if (opPart === "text") {
-                                                op = "text";
-                                            } else if (opPart === "html") {
-                                                op = "html";
-                                            }
-                                        } else if (spec.trim().startsWith("::")) {
-                                            // Handle case where selector is implicit (self) e.g. ":: text"
-                                            selector = null;
-                                            const opPart = spec.trim().substring(2).trim();
-                                            if (opPart.startsWith("attr(")) {
-                                                op = "attr";
-                                                param = opPart.slice(5, -1);
-                                            } else if (opPart === "text" || opPart === "text") {
-                                                op = "text";
-                                            } else if (opPart === "html") {
-                                                op = "html";
-                                            }
-                                        }
-                                    }
-
-                                    let el = null;
-                                    // Treat empty string as "self"
-                                    if (!selector || selector.trim() === "") selector = null;
-
-                                    if (visibleOnly) {
-                                        // Find first visible match
-                                        const candidates = selector ? c.querySelectorAll(selector) : [c];
-                                        el = Array.from(candidates).find(x => isVisible(x));
-                                    } else {
-                                        el = selector ? c.querySelector(selector) : c;
-                                    }
-
-                                    if (!el) return null;
-                                    if (op === "text") return el.innerText.trim();
-                                    if (op === "html") return el.outerHTML;
-                                    if (op === "attr" && param) return el.getAttribute(param);
-                                    return null;
-                                };
-
-                                const processSchema = (c, s) => {
-                                    const out = {};
-                                    for (const [key, val] of Object.entries(s)) {
-                                        if (typeof val === "string") {
-                                            out[key] = extractSingle(c, val);
-                                        } else if (typeof val === "object" && val !== null) {
-                                            // Check if it's a leaf definition object (starts with _)
-                                            if (val._selector) {
-                                                out[key] = extractSingle(c, val);
-                                            } else {
-                                                // Nested schema
-                                                // If it has _root, scope ctx? Not processing lists here yet.
-                                                // Assuming recursive dict structure
-                                                out[key] = processSchema(c, val);
-                                            }
-                                        }
-                                    }
-                                    return out;
-                                };
-
-                                // If rootSelector is set, refine context
-                                let root = ctx;
-                                if (rootSelector) {
-                                    if (rootSelector === "body" || rootSelector === "document") {
-                                        root = document.body;
-                                    } else {
-                                        // If ctx is an element, this searches descendants
-                                        root = ctx.querySelector(rootSelector);
-                                    }
-                                }
-                                if (!root) return null;
-
-                                return processSchema(root, schema);
-                            }
-                            """
-
-                            extracted_data = await ctx.evaluate(
-                                js_extract_compat,
-                                {
-                                    "rootSelector": action.selector,
-                                    "schema": action.schema,
-                                },
-                            )
-                            result.data = extracted_data
-
-                    case "select":
-                        # Locator also has select_option
-                        await ctx.select_option(
-                            selector=action.selector,  # For locator, if selector provided, it finds sub-element?
-                            # Locator.select_option(value, ...) -> calls on self?
-                            # Page.select_option(selector, value)
-                            # If page is Locator, and selector is provided, do we perform relative select?
-                            # locator.locator(selector).select_option(...) logic
-                            value=str(action.value),
-                            timeout=action.timeout,
-                        ) if isinstance(ctx, Page) else await ctx.locator(
-                            action.selector
-                        ).select_option(str(action.value), timeout=action.timeout)
-
-                    case "hover":
-                        if action.selector:
-                            if isinstance(ctx, Page):
-                                await ctx.hover(action.selector, timeout=action.timeout)
-                            else:
-                                await ctx.locator(action.selector).hover(
-                                    timeout=action.timeout
-                                )
-
-                    case "screenshot":
-                        path = str(action.value) if action.value else None
-
-                        # Handle full_page on Locator (not supported, must use Page)
-                        screenshot_ctx = ctx
-                        kwargs = {}
-                        if action.full_page:
-                            kwargs["full_page"] = True
-                            if not isinstance(ctx, Page):
-                                # If we are in a Locator (e.g. inside loop loop), but want full page,
-                                # we must switch to the page context.
-                                screenshot_ctx = ctx.page
-
-                        if action.options:
-                            # Map allowed options to playwright screenshot kwargs
-                            allowed = [
-                                "type",
-                                "quality",
-                                "omit_background",
-                                "clip",
-                                "mask",
-                                "animations",
-                                "caret",
-                                "scale",
-                            ]
-                            for k, v in action.options.items():
-                                if k in allowed:
-                                    kwargs[k] = v
-
-                        img_bytes = await screenshot_ctx.screenshot(path=path, **kwargs)
-                        if not path:
-                            result.data = img_bytes
-
-                    case "wait_for_load":
-                        target_page = ctx if isinstance(ctx, Page) else ctx.page
-                        await target_page.wait_for_load_state(
-                            "networkidle", timeout=action.timeout
-                        )
-
-                    case "evaluate":
-                        if action.value:
-                            eval_result = await ctx.evaluate(str(action.value))
-                            result.data = eval_result
-
-                    case "validate":
-                        try:
-                            state = action.state or "attached"
-                            if isinstance(ctx, Page):
-                                await ctx.wait_for_selector(
-                                    action.selector,
-                                    timeout=action.timeout or 5000,
-                                    state=state,
-                                )
-                            else:
-                                await ctx.locator(action.selector).first.wait_for(
-                                    timeout=action.timeout or 5000, state=state
-                                )
-                            result.success = True
-                        except Exception:
-                            result.success = False
-                            result.error = (
-                                f"Validation failed: {action.selector} not {state}"
-                            )
-
-                    case "solve_captcha":
-                        # Requires Page context for solver
-                        target_page = ctx if isinstance(ctx, Page) else ctx.page
-
-                        if action.provider in ("cdp", "scraping_browser"):
-                            from ...captcha import CDPSolver
-
-                            solver = CDPSolver()
-                        else:
-                            from ...captcha import TwoCaptchaSolver
-
-                            solver = TwoCaptchaSolver()
-
-                        token = await solver.solve(target_page, action)
-                        # Token might be None if no captcha detected or failed
-                        if token:
-                            result.data = token
-                        elif action.fail_on_error:
-                            # If we strictly required a solution
-                            result.success = False
-                            result.error = "Failed to solve CAPTCHA or none detected"
-                        else:
-                            # Treated as success/skipped if no captcha found and not strict
-                            result.data = "No CAPTCHA resolved"
-
-                    case "if":
-                        # Check condition (selector presence)
-                        condition_met = False
-                        if action.selector:
-                            # Check visibility/existence
-                            try:
-                                if isinstance(ctx, Page):
-                                    # Use strict=False, state=visible/attached?
-                                    # Just check count > 0 or wait with short timeout?
-                                    # Let's use is_visible or check count to avoid waiting if timeout=0
-                                    if action.timeout > 0:
-                                        try:
-                                            await ctx.wait_for_selector(
-                                                action.selector,
-                                                timeout=action.timeout,
-                                                state=action.state or "visible",
-                                            )
-                                            condition_met = True
-                                        except Exception:
-                                            condition_met = False
-                                    else:
-                                        # Instant check
-                                        condition_met = await ctx.locator(
-                                            action.selector
-                                        ).first.is_visible()
-                                # Locator context
-                                elif action.timeout > 0:
-                                    try:
-                                        await ctx.locator(
-                                            action.selector
-                                        ).first.wait_for(
-                                            timeout=action.timeout,
-                                            state=action.state or "visible",
-                                        )
-                                        condition_met = True
-                                    except Exception:
-                                        condition_met = False
-                                else:
-                                    condition_met = await ctx.locator(
-                                        action.selector
-                                    ).first.is_visible()
-                            except Exception as e:
-                                logger.debug(f"IF condition check failed: {e}")
-                                condition_met = False
-
-                        if condition_met:
-                            if action.then_actions:
-                                result.data = await execute_actions(
-                                    ctx, action.then_actions
-                                )
-                        elif action.else_actions:
-                            result.data = await execute_actions(
-                                ctx, action.else_actions
-                            )
-
-                    case "try":
-                        # Try/Catch block
-                        # The 'try' block is 'action.actions'
-                        # The 'catch' block is 'action.else_actions'
-                        if not action.actions:
-                            result.success = False
-                            result.error = "TRY requires actions list"
-                        else:
-                            try:
-                                # We need to ensure fail_on_error behaves locally?
-                                # If sub-actions fail, do we catch it?
-                                # Yes, execute_actions catches internal errors but returns error results.
-                                # But if they raise Exceptions (due to fail_on_error=True in child), we catch that.
-
-                                # We should probably NOT force fail_on_error=True for children unless specified?
-                                # But if children have it set, they raise.
-
-                                sub_results = await execute_actions(ctx, action.actions)
-
-                                # Check if any failed in strict mode logic?
-                                # If execute_actions returns, it means no undetected exception raised.
-                                # But did they succeed?
-                                any_failed = any(not r.success for r in sub_results)
-                                if any_failed:
-                                    # Treat as failure?
-                                    # 'try' usually catches Exceptions.
-                                    # If we want to catch Logic Failures, we should check results.
-                                    # Let's assume 'try' is for Exceptions/Handling quirks.
-                                    # If execute_actions returned, technically the flow worked.
-                                    result.data = sub_results
-
-                            except Exception as e:
-                                logger.warning(
-                                    f"[browser] TRY block failed, executing CATCH: {e}"
-                                )
-                                if action.else_actions:
-                                    result.data = await execute_actions(
-                                        ctx, action.else_actions
-                                    )
-                                else:
-                                    # Swallowed exception if no catch block
-                                    pass
-
-                    case _:
-                        logger.warning(f"[browser] Unknown action: {action.action}")
-                        result.success = False
-                        result.error = f"Unknown action: {action.action}"
-                        span.set_attribute("error", True)
+                handler = _DISPATCH.get(action.action)
+                if handler is None:
+                    logger.warning(f"[browser] Unknown action: {action.action}")
+                    result.success = False
+                    result.error = f"Unknown action: {action.action}"
+                    span.set_attribute("error", True)
+                else:
+                    await handler(ctx, action, result)
 
             except Exception as e:
                 # ... existing error handling ...
@@ -644,7 +185,7 @@ async def execute_actions(
 
             finally:
                 result.duration = time.perf_counter() - start_time
-                
+
                 # Enhanced OTel Attributes
                 span.set_attribute("phantomfetch.action.success", result.success)
                 span.set_attribute("phantomfetch.action.duration_ms", result.duration * 1000)
@@ -656,6 +197,500 @@ async def execute_actions(
     return results
 
 
+@_register("wait")
+async def _wait(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    if action.selector:
+        state = action.state or "visible"
+        if isinstance(ctx, Page):
+            await ctx.wait_for_selector(
+                action.selector,
+                timeout=action.timeout,
+                state=state,
+            )
+        else:
+            # Start from locator context
+            await ctx.locator(action.selector).first.wait_for(
+                timeout=action.timeout, state=state
+            )
+    elif action.timeout:
+        target_page = ctx if isinstance(ctx, Page) else ctx.page
+        await target_page.wait_for_timeout(action.timeout)
+
+
+@_register("loop")
+async def _loop(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    if not action.selector or not action.actions:
+        result.success = False
+        result.error = "Loop requires selector and child actions"
+        return
+
+    # 1. Find all elements on the resolved context
+    elements = await ctx.locator(action.selector).all()
+    loop_results = []
+
+    limit = action.max_iterations or 100
+    logger.debug(f"[browser] Looping over {len(elements)} elements (limit={limit})")
+
+    for i, el in enumerate(elements):
+        if i >= limit:
+            break
+        # 2. Execute child actions on EACH element locator
+        sub_res = await execute_actions(el, action.actions)
+        loop_results.append({"index": i, "results": sub_res})
+
+    result.data = loop_results
+
+
+@_register("click")
+async def _click(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    if action.selector:
+        if action.human_like:
+            # Human-like click
+            # Resolve handle first
+            if isinstance(ctx, Page):
+                handle = await ctx.wait_for_selector(
+                    action.selector,
+                    timeout=action.timeout,
+                    state="visible",
+                )
+            else:
+                # Locator context
+                target = ctx.locator(action.selector).first
+                await target.wait_for(timeout=action.timeout, state="visible")
+                handle = await target.element_handle()
+
+            if handle:
+                # Need page for mouse move
+                target_page = ctx if isinstance(ctx, Page) else ctx.page
+                await _human_mouse_move(target_page, handle)
+                await handle.click(delay=random.randint(50, 150))
+        else:
+            await ctx.click(
+                action.selector,
+                timeout=action.timeout,
+            )
+    # Context click (no selector)
+    elif isinstance(ctx, Page):
+        result.success = False
+        result.error = "Click action on Page requires a selector"
+    elif action.human_like:
+        # Human-like click on self (ctx is locator)
+        handle = await ctx.element_handle()
+        if handle:
+            target_page = ctx.page
+            await _human_mouse_move(target_page, handle)
+            await handle.click(delay=random.randint(50, 150))
+    else:
+        await ctx.click(timeout=action.timeout)
+
+
+@_register("input")
+async def _input(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    if action.selector:
+        # Input into descendant
+        val_str = str(action.value)
+        if action.human_like:
+            await ctx.click(action.selector, timeout=action.timeout)
+            target_page = ctx if isinstance(ctx, Page) else ctx.page
+            await _human_type(target_page, val_str)
+        else:
+            await ctx.fill(
+                action.selector,
+                val_str,
+                timeout=action.timeout,
+            )
+    # Input into self (ctx is locator)
+    elif isinstance(ctx, Page):
+        result.success = False
+        result.error = "Input action on Page requires a selector"
+    else:
+        val_str = str(action.value)
+        if action.human_like:
+            await ctx.click(timeout=action.timeout)
+            target_page = ctx.page
+            await _human_type(target_page, val_str)
+        else:
+            await ctx.fill(val_str, timeout=action.timeout)
+
+
+@_register("scroll")
+async def _scroll(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    # Scroll usually implies page-level or element-level scroll
+    # For now, keep page level logic mostly
+    target_page = ctx if isinstance(ctx, Page) else ctx.page
+
+    if action.selector == "top":
+        await target_page.evaluate("window.scrollTo(0, 0)")
+    elif action.x is not None or action.y is not None:
+        x = action.x or 0
+        y = action.y or 0
+        await target_page.evaluate(f"window.scrollTo({x}, {y})")
+    elif action.selector:
+        # Scroll specific element into view
+        await ctx.locator(action.selector).scroll_into_view_if_needed(
+            timeout=action.timeout
+        )
+    else:
+        await target_page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+
+# Extraction script, compatible with both Page.evaluate and Locator.evaluate
+_EXTRACT_JS = """
+(nodeOrArgs, argsIfNode) => {
+    // Logic to detect if called on element or page
+    let ctx = document;
+    let args = nodeOrArgs;
+
+    if (nodeOrArgs instanceof Node) {
+        ctx = nodeOrArgs;
+        args = argsIfNode;
+    }
+
+    const { rootSelector, schema } = args;
+
+    const getEl = (c, s) => s ? c.querySelector(s) : c;
+
+    const isVisible = (el) => {
+        if (!el) return false;
+        return el.offsetParent !== null && window.getComputedStyle(el).display !== 'none' && window.getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    const extractSingle = (c, spec) => {
+        let selector = spec;
+        let op = "text";
+        let param = null;
+        let visibleOnly = false;
+
+        if (typeof spec === "object" && spec !== null && spec._selector) {
+            selector = spec._selector;
+            visibleOnly = !!spec._visible_only;
+        } else if (typeof spec === "string") {
+            if (spec.includes(" :: ")) {
+                const parts = spec.split(" :: ");
+                selector = parts[0];
+                const opPart = parts[1];
+                if (opPart.startsWith("attr(")) {
+                    op = "attr";
+                    param = opPart.slice(5, -1);
+                } else if (opPart === "text") {
+                    op = "text";
+                } else if (opPart === "html") {
+                    op = "html";
+                }
+            } else if (spec.trim().startsWith("::")) {
+                // Handle case where selector is implicit (self) e.g. ":: text"
+                selector = null;
+                const opPart = spec.trim().substring(2).trim();
+                if (opPart.startsWith("attr(")) {
+                    op = "attr";
+                    param = opPart.slice(5, -1);
+                } else if (opPart === "text" || opPart === "text") {
+                    op = "text";
+                } else if (opPart === "html") {
+                    op = "html";
+                }
+            }
+        }
+
+        let el = null;
+        // Treat empty string as "self"
+        if (!selector || selector.trim() === "") selector = null;
+
+        if (visibleOnly) {
+            // Find first visible match
+            const candidates = selector ? c.querySelectorAll(selector) : [c];
+            el = Array.from(candidates).find(x => isVisible(x));
+        } else {
+            el = selector ? c.querySelector(selector) : c;
+        }
+
+        if (!el) return null;
+        if (op === "text") return el.innerText.trim();
+        if (op === "html") return el.outerHTML;
+        if (op === "attr" && param) return el.getAttribute(param);
+        return null;
+    };
+
+    const processSchema = (c, s) => {
+        const out = {};
+        for (const [key, val] of Object.entries(s)) {
+            if (typeof val === "string") {
+                out[key] = extractSingle(c, val);
+            } else if (typeof val === "object" && val !== null) {
+                // Check if it's a leaf definition object (starts with _)
+                if (val._selector) {
+                    out[key] = extractSingle(c, val);
+                } else {
+                    // Nested schema
+                    // If it has _root, scope ctx? Not processing lists here yet.
+                    // Assuming recursive dict structure
+                    out[key] = processSchema(c, val);
+                }
+            }
+        }
+        return out;
+    };
+
+    // If rootSelector is set, refine context
+    let root = ctx;
+    if (rootSelector) {
+        if (rootSelector === "body" || rootSelector === "document") {
+            root = document.body;
+        } else {
+            // If ctx is an element, this searches descendants
+            root = ctx.querySelector(rootSelector);
+        }
+    }
+    if (!root) return null;
+
+    return processSchema(root, schema);
+}
+"""
+
+
+@_register("extract")
+async def _extract(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    # Validate schema
+    if not action.schema:
+        result.error = "Extraction requires a schema"
+        result.success = False
+        return
+
+    result.data = await ctx.evaluate(
+        _EXTRACT_JS,
+        {
+            "rootSelector": action.selector,
+            "schema": action.schema,
+        },
+    )
+
+
+@_register("select")
+async def _select(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    # Locator also has select_option
+    await ctx.select_option(
+        selector=action.selector,  # For locator, if selector provided, it finds sub-element?
+        # Locator.select_option(value, ...) -> calls on self?
+        # Page.select_option(selector, value)
+        # If page is Locator, and selector is provided, do we perform relative select?
+        # locator.locator(selector).select_option(...) logic
+        value=str(action.value),
+        timeout=action.timeout,
+    ) if isinstance(ctx, Page) else await ctx.locator(
+        action.selector
+    ).select_option(str(action.value), timeout=action.timeout)
+
+
+@_register("hover")
+async def _hover(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    if action.selector:
+        if isinstance(ctx, Page):
+            await ctx.hover(action.selector, timeout=action.timeout)
+        else:
+            await ctx.locator(action.selector).hover(timeout=action.timeout)
+
+
+@_register("screenshot")
+async def _screenshot(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    path = str(action.value) if action.value else None
+
+    # Handle full_page on Locator (not supported, must use Page)
+    screenshot_ctx = ctx
+    kwargs = {}
+    if action.full_page:
+        kwargs["full_page"] = True
+        if not isinstance(ctx, Page):
+            # If we are in a Locator (e.g. inside loop loop), but want full page,
+            # we must switch to the page context.
+            screenshot_ctx = ctx.page
+
+    if action.options:
+        # Map allowed options to playwright screenshot kwargs
+        allowed = [
+            "type",
+            "quality",
+            "omit_background",
+            "clip",
+            "mask",
+            "animations",
+            "caret",
+            "scale",
+        ]
+        for k, v in action.options.items():
+            if k in allowed:
+                kwargs[k] = v
+
+    img_bytes = await screenshot_ctx.screenshot(path=path, **kwargs)
+    if not path:
+        result.data = img_bytes
+
+
+@_register("wait_for_load")
+async def _wait_for_load(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    target_page = ctx if isinstance(ctx, Page) else ctx.page
+    await target_page.wait_for_load_state("networkidle", timeout=action.timeout)
+
+
+@_register("wait_for_function")
+async def _wait_for_function(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    # Poll a JS predicate instead of sleeping for a fixed time
+    if not action.value:
+        result.success = False
+        result.error = "wait_for_function requires a JS expression in value"
+        return
+
+    target_page = ctx if isinstance(ctx, Page) else ctx.page
+    await target_page.wait_for_function(str(action.value), timeout=action.timeout)
+
+
+@_register("evaluate")
+async def _evaluate(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    if action.value:
+        result.data = await ctx.evaluate(str(action.value))
+
+
+@_register("validate")
+async def _validate(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    try:
+        state = action.state or "attached"
+        if isinstance(ctx, Page):
+            await ctx.wait_for_selector(
+                action.selector,
+                timeout=action.timeout or 5000,
+                state=state,
+            )
+        else:
+            await ctx.locator(action.selector).first.wait_for(
+                timeout=action.timeout or 5000, state=state
+            )
+        result.success = True
+    except Exception:
+        result.success = False
+        result.error = f"Validation failed: {action.selector} not {state}"
+
+
+@_register("solve_captcha")
+async def _solve_captcha(
+    ctx: "Page | Locator", action: Action, result: "ActionResult"
+) -> None:
+    # Requires Page context for solver
+    target_page = ctx if isinstance(ctx, Page) else ctx.page
+
+    if action.provider in ("cdp", "scraping_browser"):
+        from ...captcha import CDPSolver
+
+        solver = CDPSolver()
+    else:
+        from ...captcha import TwoCaptchaSolver
+
+        solver = TwoCaptchaSolver()
+
+    token = await solver.solve(target_page, action)
+    # Token might be None if no captcha detected or failed
+    if token:
+        result.data = token
+    elif action.fail_on_error:
+        # If we strictly required a solution
+        result.success = False
+        result.error = "Failed to solve CAPTCHA or none detected"
+    else:
+        # Treated as success/skipped if no captcha found and not strict
+        result.data = "No CAPTCHA resolved"
+
+
+@_register("if")
+async def _if(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    # Check condition (selector presence)
+    condition_met = False
+    if action.selector:
+        # Check visibility/existence
+        try:
+            if isinstance(ctx, Page):
+                # Use strict=False, state=visible/attached?
+                # Just check count > 0 or wait with short timeout?
+                # Let's use is_visible or check count to avoid waiting if timeout=0
+                if action.timeout > 0:
+                    try:
+                        await ctx.wait_for_selector(
+                            action.selector,
+                            timeout=action.timeout,
+                            state=action.state or "visible",
+                        )
+                        condition_met = True
+                    except Exception:
+                        condition_met = False
+                else:
+                    # Instant check
+                    condition_met = await ctx.locator(
+                        action.selector
+                    ).first.is_visible()
+            # Locator context
+            elif action.timeout > 0:
+                try:
+                    await ctx.locator(action.selector).first.wait_for(
+                        timeout=action.timeout,
+                        state=action.state or "visible",
+                    )
+                    condition_met = True
+                except Exception:
+                    condition_met = False
+            else:
+                condition_met = await ctx.locator(action.selector).first.is_visible()
+        except Exception as e:
+            logger.debug(f"IF condition check failed: {e}")
+            condition_met = False
+
+    if condition_met:
+        if action.then_actions:
+            result.data = await execute_actions(ctx, action.then_actions)
+    elif action.else_actions:
+        result.data = await execute_actions(ctx, action.else_actions)
+
+
+@_register("try")
+async def _try(ctx: "Page | Locator", action: Action, result: "ActionResult") -> None:
+    # Try/Catch block
+    # The 'try' block is 'action.actions'
+    # The 'catch' block is 'action.else_actions'
+    if not action.actions:
+        result.success = False
+        result.error = "TRY requires actions list"
+        return
+
+    try:
+        # If sub-actions fail, execute_actions catches internal errors and returns
+        # error results. If they raise (fail_on_error=True in a child), we catch that.
+        sub_results = await execute_actions(ctx, action.actions)
+
+        # 'try' is for Exceptions/handling quirks; if execute_actions returned,
+        # the flow worked, but surface the results when any child failed.
+        any_failed = any(not r.success for r in sub_results)
+        if any_failed:
+            result.data = sub_results
+
+    except Exception as e:
+        logger.warning(f"[browser] TRY block failed, executing CATCH: {e}")
+        if action.else_actions:
+            result.data = await execute_actions(ctx, action.else_actions)
+        # Otherwise the exception is swallowed (no catch block)
+
+
 def actions_to_payload(actions: list[Action]) -> list[dict]:
     """
     Convert Action objects to JSON-serializable dicts for BaaS API.
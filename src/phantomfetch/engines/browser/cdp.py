@@ -5,7 +5,7 @@ from loguru import logger
 from opentelemetry import context
 from rebrowser_playwright.async_api import async_playwright
 
-from ...telemetry import get_tracer
+from ...telemetry import get_tracer, start_span
 from ...types import Action, Cookie, Proxy, Response
 from .actions import execute_actions
 from undetected_playwright import stealth_async
@@ -118,8 +118,14 @@ class CDPEngine:
             await self._playwright.stop()
             self._playwright = None
 
-    async def _handle_route(self, route: "Route") -> None:
-        """Handle network requests for caching."""
+    async def _handle_route(
+        self, route: "Route", block_set: frozenset[str] = frozenset()
+    ) -> None:
+        """Handle network requests for resource blocking and caching."""
+        if route.request.resource_type in block_set:
+            await route.abort()
+            return
+
         if not self.cache:
             await route.continue_()
             return
@@ -257,7 +263,7 @@ class CDPEngine:
         Returns:
             Response object
         """
-        with tracer.start_as_current_span("phantomfetch.engine.cdp") as span:
+        with start_span(tracer, "phantomfetch.engine.cdp") as span:
             span.set_attribute("url.full", url)
             span.set_attribute("phantomfetch.browser.headless", self.headless)
             if self.viewport:
@@ -512,25 +518,20 @@ class CDPEngine:
                     finally:
                         context.detach(token)
 
+                # Built once per fetch; membership is checked for every request
+                block_set = frozenset(block_resources or ())
+
                 async def handle_route_with_context(route: "Route") -> None:
                     # Attach the captured context
                     token = context.attach(current_ctx)
                     try:
-                        # Handle resource blocking
-                        if (
-                            block_resources
-                            and route.request.resource_type in block_resources
-                        ):
-                            await route.abort()
-                            return
-
-                        await self._handle_route(route)
+                        await self._handle_route(route, block_set)
                     finally:
                         context.detach(token)
 
                 # Setup caching, blocking and capture
                 # If we have cache OR block_resources, we need routing
-                if self.cache or block_resources:
+                if self.cache or block_set:
                     await page.route("**/*", handle_route_with_context)
 
                 # We use a single listener for both cache and capture
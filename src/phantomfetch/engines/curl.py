@@ -1,15 +1,85 @@
+import asyncio
 import random
 import time
+from http.cookies import CookieError, SimpleCookie
 from typing import Any, ClassVar, cast
+from urllib.parse import urlsplit
 
-from curl_cffi.requests import AsyncSession, RequestsError
+from curl_cffi.requests import AsyncSession, ProxySpec, RequestsError
+from curl_cffi.requests import Response as CurlResponse
 from loguru import logger
 
-from ..telemetry import get_tracer
+from ..telemetry import get_tracer, start_span
 from ..types import Cookie, Proxy, Response
 
 tracer = get_tracer()
 
+SESSION_MAX_CLIENTS = 100
+MAX_CONCURRENT_PER_HOST = 10
+
+
+def _transfer_cookies(resp: CurlResponse) -> list[Cookie]:
+    """
+    Cookies set anywhere in the transfer, including on redirect hops.
+
+    Requests run with discard_cookies=True so the pooled session's jar stays
+    empty; resp.cookies only covers the final response, so the Set-Cookie
+    headers of each hop in resp.history are parsed as well. Later hops win.
+    """
+    jar: dict[str, str] = {}
+    for hop in resp.history:
+        for header in hop.headers.get_list("set-cookie"):
+            if not header:
+                continue
+            parsed: SimpleCookie = SimpleCookie()
+            try:
+                parsed.load(header)
+            except CookieError:
+                continue
+            for name, morsel in parsed.items():
+                jar[name] = morsel.value
+    jar.update(resp.cookies.items())
+    return [Cookie(name=name, value=value) for name, value in jar.items()]
+
+
+def _close_orphaned(session: AsyncSession) -> None:
+    """
+    Release the curl handles of a session whose event loop has closed.
+
+    AsyncSession.close() has to run on the session's own loop, so once that
+    loop is gone only the idle handles (and the connections they keep open)
+    can be freed.
+    """
+    while True:
+        try:
+            handle = session.pool.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if handle is not None:
+            handle.close()
+
+
+_CHROMIUM_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36"
+)
+
+
+def _format_ua(version: str) -> str:
+    """User-Agent for a Chromium impersonation target such as "chrome124"."""
+    if version.startswith("edge"):
+        major = version.removeprefix("edge")
+        return _CHROMIUM_UA.format(major=major) + f" Edg/{major}.0.0.0"
+    return _CHROMIUM_UA.format(major=version.removeprefix("chrome"))
+
+
+def _status_mask(codes: set[int]) -> int:
+    """Pack status codes into an int bitmap, tested with (mask >> status) & 1."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
 
 class CurlEngine:
     """
@@ -23,21 +93,48 @@ class CurlEngine:
         "safari15_3",
     ]
 
-    USER_AGENTS: ClassVar[dict[str, list[str]]] = {}  # Deprecated: let curl_cffi handle it
+    # (version, User-Agent) for each Chromium target, formatted once at import
+    _UA_TABLE: ClassVar[tuple[tuple[str, str], ...]] = tuple(
+        (v, _format_ua(v)) for v in BROWSER_VERSIONS if v.startswith(("chrome", "edge"))
+    )
 
     RETRY_STATUS_CODES: ClassVar[set[int]] = {429, 500, 502, 503, 504}
 
+    # Copied by _build_headers; never mutate in place
+    _BASE_HEADERS: ClassVar[dict[str, str]] = {
+        "Accept": (
+            "text/html,application/xhtml+xml,application/xml;q=0.9,"
+            "image/avif,image/webp,*/*;q=0.8"
+        ),
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+    }
+
     def __init__(
         self,
         timeout: float = 30.0,
         max_retries: int = 3,
         retry_backoff_base: float = 2.0,
         verify_ssl: bool = True,
+        backoff_cap: float = 30.0,
+        *,
+        max_concurrent_per_host: int = MAX_CONCURRENT_PER_HOST,
     ):
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_backoff_base = retry_backoff_base
         self.verify_ssl = verify_ssl
+        self.backoff_cap = backoff_cap
+        self.max_concurrent_per_host = max_concurrent_per_host
+        self._retry_mask = _status_mask(self.RETRY_STATUS_CODES)
+
+        # Keep-alive sessions owned by this engine, keyed by
+        # (event loop, scheme, host, port, proxy). Reusing a session reuses its
+        # connections, so repeat requests to a host skip the TCP/TLS handshake.
+        self._sessions: dict[tuple, AsyncSession] = {}
+        self._host_limits: dict[tuple, asyncio.Semaphore] = {}
 
     async def fetch(
         self,
@@ -57,7 +154,7 @@ class CurlEngine:
         """
         timeout = timeout or self.timeout
         max_retries = max_retries or self.max_retries
-        retry_status_codes = retry_on or self.RETRY_STATUS_CODES
+        retry_mask = _status_mask(retry_on) if retry_on else self._retry_mask
         backoff_base = retry_backoff or self.retry_backoff_base
 
         start = time.perf_counter()
@@ -65,21 +162,33 @@ class CurlEngine:
         last_status: int = 0
         last_body: bytes = b""
         last_headers: dict[str, str] = {}
+        delay = 0.0
+
+        # Simplified headers: rely on curl_cffi defaults for the impersonated browser
+        # Only set Referer or explicit overrides. These are the same on every
+        # attempt, so build them once.
+        request_headers: dict[str, str] = {}
+        if referer:
+            request_headers["Referer"] = referer
+
+        if headers:
+            request_headers.update(headers)
+
+        request_cookies: dict[str, str] | None = None
+        if isinstance(cookies, dict):
+            request_cookies = cookies
+        elif cookies:
+            request_cookies = {c.name: c.value for c in cookies}
+
+        proxies: ProxySpec | None = None
+        if proxy:
+            proxies = {"http": proxy.url, "https": proxy.url}
 
         for attempt in range(max_retries):
             # Select modern impersonation target
             impersonate = random.choice(self.BROWSER_VERSIONS)
-            
-            # Simplified headers: rely on curl_cffi defaults for the impersonated browser
-            # Only set Referer or explicit overrides.
-            request_headers = {}
-            if referer:
-                request_headers["Referer"] = referer
 
-            if headers:
-                request_headers.update(headers)
-
-            with tracer.start_as_current_span("phantomfetch.engine.curl") as span:
+            with start_span(tracer, "phantomfetch.engine.curl") as span:
                 span.set_attribute("url.full", url)
                 if proxy:
                     span.set_attribute("phantomfetch.proxy", proxy.url)
@@ -88,75 +197,46 @@ class CurlEngine:
                     if proxy.proxy_type:
                         span.set_attribute("phantomfetch.proxy.type", proxy.proxy_type)
                     if proxy.location:
-                        span.set_attribute("phantomfetch.proxy.location", proxy.location)
+                        span.set_attribute(
+                            "phantomfetch.proxy.location", proxy.location
+                        )
                     if proxy.provider:
-                        span.set_attribute("phantomfetch.proxy.provider", proxy.provider)
+                        span.set_attribute(
+                            "phantomfetch.proxy.provider", proxy.provider
+                        )
 
-                span.set_attribute(
-                    "phantomfetch.curl.impersonate", impersonate
+                span.set_attribute("phantomfetch.curl.impersonate", impersonate)
+
+                logger.debug(
+                    f"[curl] Attempt {attempt + 1}/{max_retries}: {url} (impersonate={impersonate})"
                 )
-                
-                # Initialize curl_kwargs
-                curl_kwargs = {
-                    "impersonate": impersonate,
-                    "timeout": timeout or self.timeout,
-                    "allow_redirects": allow_redirects,
-                }
-
-                # Add headers to kwargs
-                curl_kwargs["headers"] = request_headers
-
-                if cookies:
-                    if isinstance(cookies, dict):
-                        curl_kwargs["cookies"] = cookies
-                    elif isinstance(cookies, list):
-                        curl_kwargs["cookies"] = {c.name: c.value for c in cookies}
 
-                if proxy:
-                    curl_kwargs["proxies"] = cast(
-                        Any, {"http": proxy.url, "https": proxy.url}
-                    )
+                try:
+                    session, host_limit = self._get_session(url, proxy)
+                    async with host_limit:
+                        # The session is shared, so keep its cookie jar empty and
+                        # take cookies from this transfer only.
+                        resp = await session.get(
+                            url,
+                            headers=request_headers,
+                            cookies=request_cookies,
+                            proxies=proxies,
+                            timeout=timeout,
+                            allow_redirects=allow_redirects,
+                            impersonate=impersonate,
+                            discard_cookies=True,
+                        )
 
-                logger.debug(f"[curl] Attempt {attempt + 1}/{max_retries}: {url} (impersonate={impersonate})")
+                    last_status = resp.status_code
+                    last_body = resp.content
+                    last_headers = dict(cast(Any, resp.headers))
 
-                try:
-                    async with AsyncSession() as session:
-                        resp = await session.get(url, **curl_kwargs)
-                        # ... (success/error handling kept logically same, snipped for brevity in replacement)
-                        # Wait, I need to include the body of the loop to ensure logic is preserved.
-                        
-                        last_status = resp.status_code
-                        last_body = resp.content
-                        last_headers = dict(cast(Any, resp.headers))
-
-                        final_cookies = []
-                        for name, value in session.cookies.items():
-                            final_cookies.append(Cookie(name=name, value=value))
-
-                        span.set_attribute("http.status_code", resp.status_code)
-
-                        if 200 <= resp.status_code < 400:
-                            logger.debug(f"[curl] Success: {url} [{resp.status_code}]")
-                            return Response(
-                                url=str(resp.url),
-                                status=resp.status_code,
-                                body=resp.content,
-                                headers=dict(cast(Any, resp.headers)),
-                                engine="curl",
-                                elapsed=time.perf_counter() - start,
-                                proxy_used=proxy.url if proxy else None,
-                                cookies=final_cookies,
-                            )
-
-                        if resp.status_code in retry_status_codes:
-                            last_error = f"HTTP {resp.status_code}"
-                            logger.warning(
-                                f"[curl] Retryable {resp.status_code}, attempt {attempt + 1}"
-                            )
-                            if attempt < max_retries - 1:
-                                await self._backoff(attempt, backoff_base)
-                                continue
+                    final_cookies = _transfer_cookies(resp)
+
+                    span.set_attribute("http.status_code", resp.status_code)
 
+                    if 200 <= resp.status_code < 400:
+                        logger.debug(f"[curl] Success: {url} [{resp.status_code}]")
                         return Response(
                             url=str(resp.url),
                             status=resp.status_code,
@@ -165,16 +245,36 @@ class CurlEngine:
                             engine="curl",
                             elapsed=time.perf_counter() - start,
                             proxy_used=proxy.url if proxy else None,
-                            error=f"HTTP {resp.status_code}",
                             cookies=final_cookies,
                         )
 
+                    if (retry_mask >> resp.status_code) & 1:
+                        last_error = f"HTTP {resp.status_code}"
+                        logger.warning(
+                            f"[curl] Retryable {resp.status_code}, attempt {attempt + 1}"
+                        )
+                        if attempt < max_retries - 1:
+                            delay = await self._backoff(delay, backoff_base)
+                            continue
+
+                    return Response(
+                        url=str(resp.url),
+                        status=resp.status_code,
+                        body=resp.content,
+                        headers=dict(cast(Any, resp.headers)),
+                        engine="curl",
+                        elapsed=time.perf_counter() - start,
+                        proxy_used=proxy.url if proxy else None,
+                        error=f"HTTP {resp.status_code}",
+                        cookies=final_cookies,
+                    )
+
                 except RequestsError as e:
                     last_error = str(e)
                     logger.warning(f"[curl] RequestsError: {e}, attempt {attempt + 1}")
                     span.record_exception(e)
                     if attempt < max_retries - 1:
-                        await self._backoff(attempt, backoff_base)
+                        delay = await self._backoff(delay, backoff_base)
                         continue
                 except Exception as e:
                     logger.error(f"[curl] Error: {e}")
@@ -188,7 +288,7 @@ class CurlEngine:
                         proxy_used=proxy.url if proxy else None,
                         error=str(e),
                     )
-        
+
         return Response(
             url=url,
             status=last_status,
@@ -200,15 +300,70 @@ class CurlEngine:
             error=last_error or "Max retries exhausted",
         )
 
-    # Removed _get_browser_config and _build_headers as they are now obsolete precedence logic
-    # kept purely for backward compat if needed? No, we deleted usage.
+    def _get_browser_config(self) -> tuple[str, str]:
+        """
+        Pick a random Chromium impersonation target and its User-Agent.
+
+        For callers that send an explicit User-Agent; fetch() itself leaves
+        headers to curl_cffi's impersonation defaults.
+        """
+        return random.choice(self._UA_TABLE)
+
+    def _build_headers(
+        self, user_agent: str, referer: str | None = None
+    ) -> dict[str, str]:
+        """Build a browser-like header set for user_agent."""
+        headers = self._BASE_HEADERS.copy()
+        headers["User-Agent"] = user_agent
+        if referer:
+            headers["Referer"] = referer
+        return headers
 
+    def _get_session(
+        self, url: str, proxy: Proxy | None
+    ) -> tuple[AsyncSession, asyncio.Semaphore]:
+        """Return the pooled session and concurrency limit for this host."""
+        loop = asyncio.get_running_loop()
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (loop, parts.scheme, parts.hostname, port, proxy.url if proxy else None)
 
-    async def _backoff(self, attempt: int, backoff_base: float | None = None) -> None:
-        """Exponential backoff with jitter"""
-        import asyncio
+        session = self._sessions.get(key)
+        if session is None:
+            # Drop sessions left behind by event loops that have since closed
+            for stale in [k for k in self._sessions if k[0].is_closed()]:
+                _close_orphaned(self._sessions.pop(stale))
+                self._host_limits.pop(stale, None)
 
+            session = AsyncSession(max_clients=SESSION_MAX_CLIENTS)
+            self._sessions[key] = session
+            self._host_limits[key] = asyncio.Semaphore(self.max_concurrent_per_host)
+
+        return session, self._host_limits[key]
+
+    async def aclose(self) -> None:
+        """Close the sessions this engine has pooled."""
+        loop = asyncio.get_running_loop()
+        for key in [k for k in self._sessions if k[0] is loop or k[0].is_closed()]:
+            session = self._sessions.pop(key)
+            self._host_limits.pop(key, None)
+            if key[0] is loop:
+                await session.close()
+            else:
+                _close_orphaned(session)
+
+    async def _backoff(
+        self, prev_delay: float = 0.0, backoff_base: float | None = None
+    ) -> float:
+        """
+        Sleep with decorrelated jitter and return the delay used.
+
+        Each delay is drawn from [base, prev_delay * 3] and capped at
+        backoff_cap, so concurrent retries spread out instead of firing in
+        synchronized waves. Pass the returned delay back in on the next attempt.
+        """
         base = backoff_base or self.retry_backoff_base
-        wait = base**attempt * (0.5 + random.random())
-        logger.debug(f"[curl] Backoff: {wait:.2f}s")
-        await asyncio.sleep(wait)
+        delay = min(self.backoff_cap, random.uniform(base, max(base, prev_delay) * 3))
+        logger.debug(f"[curl] Backoff: {delay:.2f}s")
+        await asyncio.sleep(delay)
+        return delay
@@ -8,7 +8,7 @@ from loguru import logger
 from .cache import Cache, FileSystemCache
 from .engines import CDPEngine, CurlEngine
 from .pool import ProxyPool
-from .telemetry import get_tracer
+from .telemetry import get_tracer, start_span
 from .types import (
     Action,
     Cookie,
@@ -42,6 +42,7 @@ class Fetcher:
         max_retries: int = 3,
         max_concurrent: int = 50,
         max_concurrent_browser: int = 10,
+        max_concurrent_per_host: int = 10,
         # Cache
         cache: Cache | bool | None = None,
         # Advanced CDP
@@ -62,6 +63,7 @@ class Fetcher:
             max_retries: Max retries for curl requests
             max_concurrent: Max concurrent curl requests
             max_concurrent_browser: Max concurrent browser requests
+            max_concurrent_per_host: Max concurrent curl requests to one host
             cache: Cache implementation (e.g. FileSystemCache)
             cdp_use_existing_page: Reuse existing page in remote CDP (default: True)
         """
@@ -86,6 +88,7 @@ class Fetcher:
         self._curl = CurlEngine(
             timeout=timeout,
             max_retries=max_retries,
+            max_concurrent_per_host=max_concurrent_per_host,
         )
         
         if browser_engine == "baas":
@@ -120,21 +123,25 @@ class Fetcher:
         return self
 
     async def __aexit__(self, *args: Any) -> None:
+        if isinstance(self.cache, FileSystemCache):
+            await self.cache.flush()
         await self._browser.disconnect()
+        await self._curl.aclose()
 
     async def start(self) -> None:
         """
         Start the browser engine.
         """
         if self._browser:
-            await self._browser.start()
+            await self._browser.connect()
 
     async def stop(self) -> None:
         """
-        Stop the browser engine.
+        Stop the browser engine and close pooled curl sessions.
         """
         if self._browser:
-            await self._browser.stop()
+            await self._browser.disconnect()
+        await self._curl.aclose()
 
     def save_session(self, path: str) -> None:
         """
@@ -265,7 +272,7 @@ class Fetcher:
             engine = "browser"
 
         # Start OTel span
-        with tracer.start_as_current_span("phantomfetch.fetch") as span:
+        with start_span(tracer, "phantomfetch.fetch") as span:
             span.set_attribute("url.full", url)
             span.set_attribute("phantomfetch.engine", engine)
             span.set_attribute("phantomfetch.cache.enabled", bool(self.cache))
@@ -316,7 +323,7 @@ class Fetcher:
                     p_url = proxy if isinstance(proxy, str) else proxy.url
                     # Sanitize sensitive info? user:pass might be sensitive, 
                     # but for cache key uniqueness it's needed. 
-                    # Since MD5 is used downstream, it's somewhat obscured.
+                    # Since the key is hashed downstream, it's somewhat obscured.
                     cache_key_parts.append(f"proxy={p_url}")
 
                 cache_key = ":".join(cache_key_parts)
@@ -1,5 +1,7 @@
+import itertools
 import random
 import time
+from collections.abc import Iterable, Sequence
 from typing import Any, cast
 from urllib.parse import urlparse
 
@@ -10,11 +12,25 @@ class ProxyPool:
     def __init__(
         self, proxies: list[Proxy | str], strategy: ProxyStrategy = "round_robin"
     ):
-        self.proxies = [p if isinstance(p, Proxy) else Proxy(url=p) for p in proxies]
+        self.proxies = proxies
         self.strategy = strategy
         self._index = 0
         self._domain_map: dict[str, Proxy] = {}
 
+    @property
+    def proxies(self) -> tuple[Proxy, ...]:
+        """Proxies in the pool. Assign a new list to replace them."""
+        return self._proxies
+
+    @proxies.setter
+    def proxies(self, proxies: Iterable[Proxy | str]) -> None:
+        self._proxies = tuple(
+            p if isinstance(p, Proxy) else Proxy(url=p) for p in proxies
+        )
+        # Round-robin fast path for when no proxy is filtered out or cooling
+        # down. The tuple can't change in place, so only reassignment resets it.
+        self._rotation = itertools.cycle(self._proxies)
+
     def get(
         self,
         url: str | None = None,
@@ -28,7 +44,7 @@ class ProxyPool:
         now = time.time()
 
         # Filter by criteria
-        candidates = self.proxies
+        candidates: Sequence[Proxy] = self._proxies
         if location:
             candidates = [p for p in candidates if p.location == location]
         if vendor:
@@ -51,14 +67,18 @@ class ProxyPool:
         # Fail-Open: If all candidates are on cool-down, use the ones expiring soonest
         if not healthy_candidates:
             # Sort by cooldown_until ascending
-            candidates.sort(key=lambda p: p.cooldown_until)
+            recovering = sorted(candidates, key=lambda p: p.cooldown_until)
             # Take the top 20% or at least 1 to distribute load among recovering proxies
-            take_count = max(1, len(candidates) // 5)
-            healthy_candidates = candidates[:take_count]
+            take_count = max(1, len(recovering) // 5)
+            healthy_candidates = recovering[:take_count]
 
         # Apply strategy on healthy candidates
         match self.strategy:
             case "round_robin":
+                if len(healthy_candidates) == len(self._proxies):
+                    # Nothing filtered out: rotate through the whole pool
+                    return next(self._rotation)
+
                 # We need to maintain index stability relative to the original list or just pick from healthy?
                 # Simple round-robin on filtered list is tricky because it changes every time.
                 # Let's fallback to random on filtered list for simplicity, or maintain a global index.
@@ -68,6 +88,10 @@ class ProxyPool:
                 return proxy
 
             case "random":
+                # Read per call: Proxy.weight can change after construction
+                weights = [p.weight for p in healthy_candidates]
+                if sum(weights) > 0:
+                    return random.choices(healthy_candidates, weights=weights)[0]
                 return random.choice(healthy_candidates)
 
             case "geo_match":
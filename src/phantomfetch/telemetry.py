@@ -1,3 +1,5 @@
+from contextlib import AbstractContextManager, nullcontext
+
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
@@ -33,3 +35,33 @@ def configure_telemetry(
 def get_tracer() -> trace.Tracer:
     """Get the phantomfetch tracer."""
     return trace.get_tracer("phantomfetch")
+
+
+# Reusable stand-in for start_as_current_span when tracing is off
+_NOOP_SPAN = nullcontext(trace.INVALID_SPAN)
+
+
+class _TracingState:
+    # The global provider can only be set once, so a positive answer is final
+    enabled = False
+
+
+def tracing_enabled() -> bool:
+    """Whether a real tracer provider has been installed."""
+    if not _TracingState.enabled:
+        _TracingState.enabled = not isinstance(
+            trace.get_tracer_provider(), trace.ProxyTracerProvider
+        )
+    return _TracingState.enabled
+
+
+def start_span(tracer: trace.Tracer, name: str) -> AbstractContextManager[trace.Span]:
+    """
+    Start a span as the current span.
+
+    When no tracer provider is configured this returns a shared no-op context,
+    skipping the proxy tracer and context attach/detach entirely.
+    """
+    if not tracing_enabled():
+        return _NOOP_SPAN
+    return tracer.start_as_current_span(name)
@@ -8,6 +8,10 @@ EngineType = Literal["curl", "browser", "auto"]
 ProxyStrategy = Literal["round_robin", "random", "sticky", "geo_match", "failover"]
 CacheStrategy = Literal["all", "resources", "conservative"]
 
+# Shared codecs, so JSON helpers don't rebuild decoder/encoder state per call
+_JSON_DECODER = msgspec.json.Decoder()
+_JSON_ENCODER = msgspec.json.Encoder()
+
 ActionTypeLiteral = Literal[
     "wait",
     "click",
@@ -17,6 +21,7 @@ ActionTypeLiteral = Literal[
     "hover",
     "screenshot",
     "wait_for_load",
+    "wait_for_function",
     "evaluate",
     "solve_captcha",
 ]
@@ -31,6 +36,7 @@ class ActionType(str, Enum):
     HOVER = "hover"
     SCREENSHOT = "screenshot"
     WAIT_FOR_LOAD = "wait_for_load"
+    WAIT_FOR_FUNCTION = "wait_for_function"
     EVALUATE = "evaluate"
     SOLVE_CAPTCHA = "solve_captcha"
     EXTRACT = "extract"
@@ -66,7 +72,7 @@ class Proxy(msgspec.Struct):
 
 
 
-class Action(msgspec.Struct):
+class Action(msgspec.Struct, frozen=True, kw_only=True):
     """
     Browser interaction definition.
 
@@ -123,7 +129,7 @@ class ActionResult(msgspec.Struct):
     duration: float = 0.0
 
 
-class NetworkExchange(msgspec.Struct):
+class NetworkExchange(msgspec.Struct, frozen=True, kw_only=True, gc=False):
     """
     Captured network request/response details.
 
@@ -149,8 +155,28 @@ class NetworkExchange(msgspec.Struct):
     response_body: str | None = None
     duration: float = 0.0
 
+    @property
+    def parsed_body(self) -> Any:
+        """
+        Return the response body decoded as JSON.
+
+        Returns None if there is no body, the content type is not JSON, or the
+        body fails to decode.
+        """
+        if not self.response_body:
+            return None
+        content_type = self.response_headers.get(
+            "content-type"
+        ) or self.response_headers.get("Content-Type", "")
+        if "json" not in content_type:
+            return None
+        try:
+            return _JSON_DECODER.decode(self.response_body)
+        except msgspec.DecodeError:
+            return None
+
 
-class Cookie(msgspec.Struct):
+class Cookie(msgspec.Struct, frozen=True, kw_only=True, gc=False):
     """
     Cookie definition.
 
@@ -227,9 +253,12 @@ class Response(msgspec.Struct):
         """
         if not self.body:
             return None
-        # Strip null bytes which can cause decode errors
-        clean_body = self.body.replace(b"\x00", b"")
-        return msgspec.json.decode(clean_body)
+        body = self.body
+        # Strip null bytes which can cause decode errors; the memchr check
+        # avoids copying the body in the common case where there are none
+        if b"\x00" in body:
+            body = body.translate(None, b"\x00")
+        return _JSON_DECODER.decode(body)
 
     def to_page(self) -> "WebPage":
         return WebPage(
@@ -249,9 +278,9 @@ class Response(msgspec.Struct):
         Returns:
             The absolute path to the saved HAR file.
         """
-        import json
         import os
         import time
+        from pathlib import Path
         from urllib.parse import urlparse
 
         if not self.network_log:
@@ -340,7 +369,8 @@ class Response(msgspec.Struct):
             }
         }
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(har_data, f, indent=2)
+        Path(path).write_bytes(
+            msgspec.json.format(_JSON_ENCODER.encode(har_data), indent=2)
+        )
 
         return path
@@ -0,0 +1,28 @@
+"""Minimal HAR schema for decoding files written by Response.save_har."""
+
+import msgspec
+
+
+class HarCreator(msgspec.Struct):
+    name: str
+    version: str
+
+
+class HarRequest(msgspec.Struct):
+    method: str
+    url: str
+
+
+class HarEntry(msgspec.Struct):
+    time: float
+    request: HarRequest
+
+
+class HarLog(msgspec.Struct):
+    version: str
+    creator: HarCreator
+    entries: list[HarEntry]
+
+
+class HarFile(msgspec.Struct):
+    log: HarLog
@@ -0,0 +1,64 @@
+"""Prebuilt Playwright mocks for engine tests."""
+
+from collections.abc import Iterable
+from typing import Any
+from unittest.mock import Mock
+
+from rebrowser_playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Request,
+    Route,
+)
+from rebrowser_playwright.async_api import Response as PlaywrightResponse
+
+
+def make_fake_page(
+    *,
+    status: int = 200,
+    content: str | Exception = "<html></html>",
+    cookies: Iterable[dict[str, Any]] = (),
+    url: str = "http://example.com",
+) -> tuple[Mock, Mock, Mock]:
+    """
+    Build a mock browser, context and page wired together.
+
+    The mocks are specced against the Playwright classes the engine imports,
+    so coroutine methods are AsyncMocks and unknown attributes raise.
+
+    ``browser.new_context()`` returns the context and ``context.new_page()``
+    returns the page. ``page.goto()`` resolves to a response with ``status``.
+    Pass an exception as ``content`` to make ``page.content()`` raise.
+
+    Returns:
+        (browser, context, page)
+    """
+    page = Mock(spec=Page)
+    page.url = url
+
+    response = Mock(spec=PlaywrightResponse)
+    response.status = status
+    response.headers = {}
+    page.goto.return_value = response
+
+    if isinstance(content, Exception):
+        page.content.side_effect = content
+    else:
+        page.content.return_value = content
+
+    context = Mock(spec=BrowserContext)
+    context.new_page.return_value = page
+    context.cookies.return_value = list(cookies)
+
+    browser = Mock(spec=Browser)
+    browser.new_context.return_value = context
+
+    return browser, context, page
+
+
+def make_route(resource_type: str, *, method: str = "GET") -> Mock:
+    """Build a mock route whose request has the given resource type."""
+    route = Mock(spec=Route)
+    route.request = Mock(spec=Request, resource_type=resource_type, method=method)
+    return route
@@ -0,0 +1,42 @@
+"""Shared pytest fixtures."""
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from _mock_factory import make_fake_page
+
+from phantomfetch import Fetcher
+from phantomfetch.engines.browser.cdp import CDPEngine
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def fetcher():
+    """A single entered Fetcher shared by every test in the session."""
+    async with Fetcher() as f:
+        yield f
+
+
+@pytest.fixture(scope="session")
+def make_engine():
+    """
+    Factory for a CDPEngine attached to a mock browser from make_fake_page.
+
+    Each call returns a fresh ``(engine, page)`` pair. Keyword arguments are
+    passed to make_fake_page; ``wait_for_url_side_effect`` makes
+    ``page.wait_for_url()`` raise.
+    """
+
+    def factory(
+        wait_for_url_side_effect: Exception | None = None, **page_options: Any
+    ) -> tuple[CDPEngine, AsyncMock]:
+        browser, _, page = make_fake_page(**page_options)
+        if wait_for_url_side_effect is not None:
+            page.wait_for_url.side_effect = wait_for_url_side_effect
+
+        engine = CDPEngine(headless=True)
+        engine._browser = browser
+        return engine, page
+
+    return factory
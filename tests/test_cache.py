@@ -1,8 +1,7 @@
 """Tests for FileSystemCache."""
 
-import shutil
-import tempfile
-from pathlib import Path
+import asyncio
+from unittest.mock import patch
 
 import pytest
 
@@ -14,23 +13,28 @@ class TestFileSystemCache:
     """Test FileSystemCache functionality."""
 
     @pytest.fixture
-    def temp_cache_dir(self):
-        """Create temporary cache directory."""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir, ignore_errors=True)
-
-    @pytest.fixture
-    def cache(self, temp_cache_dir):
+    def cache(self, tmp_path):
         """Create cache instance with temp directory."""
-        return FileSystemCache(cache_dir=temp_cache_dir, strategy="resources")
+        return FileSystemCache(cache_dir=str(tmp_path), strategy="resources")
 
-    def test_cache_init(self, temp_cache_dir):
+    def test_cache_init(self, tmp_path):
         """Test cache initialization."""
-        cache = FileSystemCache(cache_dir=temp_cache_dir)
-        assert cache.cache_dir == Path(temp_cache_dir)
+        cache = FileSystemCache(cache_dir=str(tmp_path))
+        assert cache.cache_dir == tmp_path
         assert cache.strategy == "resources"
 
+    @pytest.mark.asyncio
+    async def test_cache_dir_created_on_first_write(self, tmp_path):
+        """Test the cache directory is only created once something is stored."""
+        cache = FileSystemCache(cache_dir=tmp_path / "cache")
+        assert not cache.cache_dir.exists()
+        assert await cache.get("https://example.com/") is None
+
+        response = Response(url="https://example.com/", status=200, body=b"x")
+        await cache.set("https://example.com/", response)
+        await cache.flush()
+        assert cache.cache_dir.is_dir()
+
     def test_cache_strategies(self):
         """Test different cache strategies."""
         cache_all = FileSystemCache(strategy="all")
@@ -59,12 +63,28 @@ class TestFileSystemCache:
         assert cache.should_block("https://doubleclick.net/ad")
         assert not cache.should_block("https://example.com/page")
 
+    def test_should_block_after_update(self, cache):
+        """Test blocked_domains changes after init are picked up."""
+        cache.block_domain("tracker.example.com")
+        assert cache.should_block("https://tracker.example.com/pixel")
+
+        cache.unblock_domain("tracker.example.com")
+        assert not cache.should_block("https://tracker.example.com/pixel")
+
+        cache.blocked_domains = set()
+        assert not cache.should_block("https://doubleclick.net/ad")
+
+    def test_blocked_domains_is_immutable(self, cache):
+        """Test in-place edits fail loudly instead of leaving the matcher stale."""
+        with pytest.raises(AttributeError):
+            cache.blocked_domains.add("tracker.example.com")
+
     def test_cache_key_generation(self, cache):
         """Test cache key generation."""
         url = "https://example.com/page"
         key = cache.get_cache_key(url)
         assert isinstance(key, str)
-        assert len(key) == 32  # MD5 hash length
+        assert len(key) == 32  # xxh128 hash length
 
         # Same URL should generate same key
         key2 = cache.get_cache_key(url)
@@ -90,6 +110,56 @@ class TestFileSystemCache:
         assert cached.status == 200
         assert cached.body == b"Test content"
 
+    @pytest.mark.asyncio
+    async def test_cache_large_body_roundtrip(self, cache):
+        """Test bodies above the compression threshold survive a roundtrip."""
+        body = b"<html>" + b"x" * 10_000 + b"</html>"
+        response = Response(url="https://example.com/big", status=200, body=body)
+
+        await cache.set("https://example.com/big", response)
+
+        # Stored compressed on disk
+        await cache.flush()
+        [stored] = cache.cache_dir.glob("*/*/*.msgpack")
+        assert stored.stat().st_size < len(body)
+
+        cached = await cache.get("https://example.com/big")
+        assert cached is not None
+        assert cached.body == body
+
+    @pytest.mark.asyncio
+    async def test_cache_writes_are_batched(self, cache):
+        """Test concurrent writes share one batch and are on disk on return."""
+        urls = [f"https://example.com/{i}" for i in range(3)]
+        with patch.object(asyncio, "to_thread", wraps=asyncio.to_thread) as to_thread:
+            await asyncio.gather(
+                *(
+                    cache.set(url, Response(url=url, status=200, body=b"x"))
+                    for url in urls
+                )
+            )
+        to_thread.assert_called_once()
+        assert len(list(cache.cache_dir.glob("*/*/*.msgpack"))) == 3
+
+        # A fresh instance only sees what was written to disk
+        reopened = FileSystemCache(cache_dir=cache.cache_dir)
+        assert await reopened.get("https://example.com/2") is not None
+
+    def test_cache_set_persists_after_loop_exit(self, tmp_path):
+        """Test an entry set without an explicit flush survives the event loop."""
+        cache = FileSystemCache(cache_dir=tmp_path)
+        url = "https://example.com/style.css"
+        response = Response(url=url, status=200, body=b"x")
+        asyncio.run(cache.set(f"curl:{url}", response))
+
+        assert cache.get_entry_path(cache.get_cache_key(url)).is_file()
+
+    def test_entry_path_sharded(self, cache):
+        """Test entries are sharded by the first two key byte pairs."""
+        key = cache.get_cache_key("https://example.com/page")
+        path = cache.get_entry_path(key)
+        assert path == cache.cache_dir / key[:2] / key[2:4] / f"{key}.msgpack"
+
     @pytest.mark.asyncio
     async def test_cache_miss(self, cache):
         """Test cache miss returns None."""
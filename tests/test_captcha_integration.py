@@ -1,7 +1,7 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-from playwright.async_api import Page
+from rebrowser_playwright.async_api import Page
 
 from phantomfetch.engines.browser.actions import execute_actions
 from phantomfetch.types import Action
@@ -35,15 +35,33 @@ async def test_solve_captcha_action():
 
 @pytest.mark.asyncio
 async def test_solve_captcha_failure():
-    mock_page = AsyncMock()
+    mock_page = Mock(spec=Page)
 
     with patch("phantomfetch.captcha.TwoCaptchaSolver") as MockSolver:
         mock_instance = MockSolver.return_value
         mock_instance.solve = AsyncMock(return_value=None)
 
-        actions = [Action(action="solve_captcha", api_key="12345")]
+        # Without fail_on_error an unsolved CAPTCHA is reported as skipped
+        actions = [Action(action="solve_captcha", api_key="12345", fail_on_error=True)]
         results = await execute_actions(mock_page, actions)
 
         assert len(results) == 1
         assert results[0].success is False
-        assert results[0].error == "Failed to solve CAPTCHA"
+        assert results[0].error == "Failed to solve CAPTCHA or none detected"
+
+
+def test_two_captcha_poll_interval_adapts(monkeypatch):
+    from phantomfetch.captcha import TwoCaptchaSolver
+
+    monkeypatch.setattr(TwoCaptchaSolver, "_expected_solve_s", 8.0)
+    assert TwoCaptchaSolver._poll_interval() == 2.0
+
+    # Slow solves stretch the interval, capped at MAX_POLL_INTERVAL
+    for _ in range(50):
+        TwoCaptchaSolver._record_solve(300.0)
+    assert TwoCaptchaSolver._poll_interval() == TwoCaptchaSolver.MAX_POLL_INTERVAL
+
+    # Fast solves shrink it, floored at MIN_POLL_INTERVAL
+    for _ in range(50):
+        TwoCaptchaSolver._record_solve(0.5)
+    assert TwoCaptchaSolver._poll_interval() == TwoCaptchaSolver.MIN_POLL_INTERVAL
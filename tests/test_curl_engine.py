@@ -1,10 +1,45 @@
 """Tests for CurlEngine."""
 
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, Mock, patch
+
 import pytest
 
+from phantomfetch.engines import curl
 from phantomfetch.engines.curl import CurlEngine
 
 
+class _RedirectHandler(BaseHTTPRequestHandler):
+    """Sets a cookie on a 302 from /login, then serves /home."""
+
+    def do_GET(self):
+        if self.path == "/login":
+            self.send_response(302)
+            self.send_header("Set-Cookie", "sid=abc; Path=/")
+            self.send_header("Location", "/home")
+        else:
+            self.send_response(200)
+            self.send_header("Set-Cookie", "theme=dark; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def local_server():
+    """Base URL of a local HTTP server running _RedirectHandler."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RedirectHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
 class TestCurlEngine:
     """Test CurlEngine functionality."""
 
@@ -14,13 +49,106 @@ class TestCurlEngine:
         assert engine.timeout == 30.0
         assert engine.max_retries == 3
         assert engine.retry_backoff_base == 2.0
+        # Sessions are created lazily on first fetch, not per engine
+        assert not engine._sessions
+
+    @pytest.mark.asyncio
+    async def test_session_pool_reused_across_fetches(self):
+        """Test that fetches to the same host share one pooled session."""
+        mock_resp = Mock(
+            status_code=200,
+            content=b"ok",
+            headers={},
+            url="https://example.com/a",
+            cookies={},
+            history=[],
+        )
+        with patch.object(curl, "AsyncSession") as MockSession:
+            MockSession.return_value.get = AsyncMock(return_value=mock_resp)
+            MockSession.return_value.close = AsyncMock()
+
+            engine = CurlEngine()
+            await engine.fetch("https://example.com/a")
+            await engine.fetch("https://example.com/b")
+            assert MockSession.call_count == 1
+
+            await engine.fetch("https://other.example.com/")
+            assert MockSession.call_count == 2
+
+            await engine.aclose()
+            assert MockSession.return_value.close.await_count == 2
+            assert not engine._sessions
+
+    @pytest.mark.asyncio
+    async def test_redirect_cookies_returned(self, local_server):
+        """Test cookies set on a redirect hop are kept, not only the final ones."""
+        engine = CurlEngine(max_retries=1)
+        resp = await engine.fetch(f"{local_server}/login")
+
+        assert resp.status == 200
+        assert {c.name: c.value for c in resp.cookies} == {
+            "sid": "abc",
+            "theme": "dark",
+        }
+
+        # The pooled session's jar stays empty
+        session, _ = engine._get_session(local_server, None)
+        assert not session.cookies
+        await engine.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_leaves_other_engines_open(self, local_server):
+        """Test closing one engine does not close sessions another still uses."""
+        first = CurlEngine(max_retries=1)
+        second = CurlEngine(max_retries=1)
+        await first.fetch(f"{local_server}/home")
+        await second.fetch(f"{local_server}/home")
+
+        await first.aclose()
+        assert not first._sessions
+
+        resp = await second.fetch(f"{local_server}/home")
+        assert resp.status == 200
+        assert resp.error is None
+        await second.aclose()
+
+    def test_orphaned_sessions_closed(self, local_server):
+        """Test sessions from a closed event loop release their curl handles."""
+
+        engine = CurlEngine(max_retries=1)
+
+        async def fetch_and_get_session():
+            await engine.fetch(f"{local_server}/home")
+            return engine._get_session(local_server, None)[0]
+
+        old = asyncio.run(fetch_and_get_session())
+        assert not old.pool.empty()
+
+        # The next session created on a new loop evicts and closes the old one
+        new = asyncio.run(fetch_and_get_session())
+        assert new is not old
+        assert old not in engine._sessions.values()
+        assert old.pool.empty()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit_configurable(self):
+        """Test max_concurrent_per_host sizes the per-host semaphore."""
+        engine = CurlEngine(max_concurrent_per_host=3)
+        assert engine.max_concurrent_per_host == 3
+
+        _, limit = engine._get_session("https://limits.example.com/", None)
+        assert limit._value == 3
+        await engine.aclose()
 
     def test_curl_engine_custom_config(self):
         """Test CurlEngine with custom configuration."""
-        engine = CurlEngine(timeout=60.0, max_retries=5, retry_backoff_base=1.5)
+        engine = CurlEngine(
+            timeout=60.0, max_retries=5, retry_backoff_base=1.5, backoff_cap=10.0
+        )
         assert engine.timeout == 60.0
         assert engine.max_retries == 5
         assert engine.retry_backoff_base == 1.5
+        assert engine.backoff_cap == 10.0
 
     def test_get_browser_config(self):
         """Test browser version and user agent generation."""
@@ -62,16 +190,33 @@ class TestCurlEngine:
 
     @pytest.mark.asyncio
     async def test_backoff_calculation(self):
-        """Test exponential backoff calculation."""
+        """Test decorrelated jitter backoff stays within its bounds."""
         engine = CurlEngine(retry_backoff_base=2.0)
 
-        # Backoff is 2^attempt * (0.5 to 1.5)
-        # We can't test exact values due to randomness, but we can test it doesn't crash
-        await engine._backoff(
-            0
-        )  # Should wait ~0.5-1.5s (but async so returns immediately in test)
-        await engine._backoff(1)  # Should wait ~1-3s
-        await engine._backoff(2, backoff_base=1.5)  # Should use custom base
+        with patch.object(curl.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+            delay = 0.0
+            for _ in range(10):
+                prev = delay
+                delay = await engine._backoff(delay)
+                # Drawn from [base, prev * 3], never above the cap
+                assert 2.0 <= delay <= min(engine.backoff_cap, max(2.0, prev) * 3)
+
+            # Custom base raises the floor
+            assert await engine._backoff(0.0, backoff_base=5.0) >= 5.0
+
+        assert mock_sleep.await_count == 11
+
+    @pytest.mark.asyncio
+    async def test_backoff_capped(self):
+        """Test backoff never exceeds the cap, even with a large base."""
+        engine = CurlEngine(retry_backoff_base=10.0, backoff_cap=15.0)
+
+        with patch.object(curl.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+            await engine._backoff(100.0)
+            await engine._backoff(8.0, backoff_base=7.0)
+
+        for call in mock_sleep.await_args_list:
+            assert call.args[0] <= 15.0
 
 
 class TestRetryLogic:
@@ -88,3 +233,10 @@ class TestRetryLogic:
 
         # 404 should not be in retry codes by default
         assert 404 not in engine.RETRY_STATUS_CODES
+
+    def test_retry_mask_matches_status_codes(self):
+        """Test the retry bitmap agrees with RETRY_STATUS_CODES."""
+        engine = CurlEngine()
+        for status in range(100, 600):
+            expected = status in engine.RETRY_STATUS_CODES
+            assert bool((engine._retry_mask >> status) & 1) is expected
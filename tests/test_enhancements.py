@@ -1,12 +1,19 @@
 import os
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import ANY, AsyncMock, Mock
 
+import msgspec
 import pytest
-from playwright.async_api import Page
+from _har_types import HarFile
+from _mock_factory import make_route
+from rebrowser_playwright.async_api import Locator, Page
 
-from phantomfetch.engines.browser.actions import execute_actions
+from phantomfetch.engines import CDPEngine
+from phantomfetch.engines.browser.actions import _DISPATCH, execute_actions
 from phantomfetch.types import Action, ActionType, NetworkExchange, Response
 
+# Built once; the Action type graph is compiled when the decoder is created
+_ACTION_DECODER = msgspec.json.Decoder(type=Action)
+
 
 # === Typing Tests ===
 def test_action_type_enum():
@@ -14,23 +21,25 @@ def test_action_type_enum():
     assert ActionType.CLICK == "click"
 
 
-def test_timeout_validation():
-    # msgspec structs are fast and don't validate fields by default in the constructor
-    # unless using msgspec.json.decode or specialized validation.
-    # However, Python's runtime type hints are just hints.
-    # But let's check if msgspec enforces validation if we use it to decode
-    # or if we rely on static analysis.
-    # The user asked for "msgspec validators".
-    # With msgspec 0.18+, `msgspec.Struct` validates on `msgspec.json.decode`.
-    # Let's try to decode invalid JSON.
-    import msgspec
+def test_every_action_type_has_handler():
+    assert set(_DISPATCH) == {t.value for t in ActionType}
+
 
-    invalid_json = b'{"action": "wait", "timeout": -1}'
-    try:
-        msgspec.json.decode(invalid_json, type=Action)
-        raise AssertionError("Should have raised ValidationError")
-    except msgspec.ValidationError:
-        pass
+@pytest.mark.parametrize(
+    "invalid_json",
+    [
+        b'{"action": "wait", "timeout": -1}',
+        b'{"action": "wait", "timeout": "soon"}',
+        b'{"action": "fly"}',
+        b'{"timeout": 1000}',
+    ],
+    ids=["negative-timeout", "wrong-type", "unknown-action", "missing-action"],
+)
+def test_timeout_validation(invalid_json):
+    # msgspec structs don't validate fields in the constructor; constraints such
+    # as Meta(ge=0) on timeout are enforced when decoding.
+    with pytest.raises(msgspec.ValidationError):
+        _ACTION_DECODER.decode(invalid_json)
 
 
 # === Action Tests ===
@@ -69,36 +78,27 @@ async def test_scroll_top():
     mock_page.evaluate.assert_called_once_with("window.scrollTo(0, 0)")
 
 
+@pytest.mark.asyncio
+async def test_wait_for_function():
+    # Inside a loop the context is a locator; the predicate runs on its page
+    mock_page = Mock(spec=Page)
+    mock_locator = Mock(spec=Locator)
+    mock_locator.page = mock_page
+
+    action = Action(action="wait_for_function", value="window.ready", timeout=5000)
+    results = await execute_actions(mock_locator, [action])
+
+    assert results[0].success is True
+    mock_page.wait_for_function.assert_called_once_with("window.ready", timeout=5000)
+
+
 # === Networking Tests ===
 @pytest.mark.asyncio
-async def test_block_resources():
+async def test_block_resources(make_engine):
     # We need to test the logic inside CDPEngine._handle_route or similar.
     # But that logic is nested inside fetch().
     # We can inspect if page.route is called.
-    from phantomfetch.engines.browser.cdp import CDPEngine
-
-    engine = CDPEngine(headless=True)
-    engine._browser = AsyncMock()
-    mock_context = AsyncMock()
-    engine._browser.new_context.return_value = mock_context
-    mock_page = AsyncMock()
-    # AsyncMock return_value means when awaited, it returns this.
-    mock_context.new_page.return_value = mock_page
-
-    # Configure synchronous methods on the mock to avoid "coroutine never awaited" warnings
-    mock_page.set_default_timeout = Mock()
-    mock_page.on = Mock()
-
-    # We want to verify that page.route is called when block_resources is passed.
-    # We also need to ensure response.status is an int to satisfy msgspec if it reaches response creation
-    # But usually we return earlier or response mocks need setup.
-    # CDPEngine.fetch calls page.goto which returns response.
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {}
-    mock_page.goto.return_value = mock_response
-    mock_page.content.return_value = "<html></html>"
-    mock_context.cookies.return_value = []  # for cookie capture
+    engine, mock_page = make_engine()
 
     await engine.fetch("http://example.com", block_resources=["image"])
 
@@ -112,8 +112,7 @@ async def test_block_resources():
     # Let's extract the handler and test it against a mock route
     handler = args[0][1]
 
-    mock_route = AsyncMock()
-    mock_route.request.resource_type = "image"
+    mock_route = make_route("image")
 
     # Execute handler
     await handler(mock_route)
@@ -122,33 +121,32 @@ async def test_block_resources():
     mock_route.abort.assert_called_once()
 
     # Test non-blocked resource
-    mock_route_script = AsyncMock()
-    mock_route_script.request.resource_type = "script"
+    mock_route_script = make_route("script")
     # engine.cache is None, so _handle_route just continues
 
     await handler(mock_route_script)
     mock_route_script.continue_.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_handle_route_blocks_listed_types(make_engine):
+    engine, _ = make_engine()
+
+    blocked = make_route("image")
+    await engine._handle_route(blocked, frozenset({"image", "media"}))
+    blocked.abort.assert_called_once()
+    blocked.continue_.assert_not_called()
+
+    allowed = make_route("document")
+    await engine._handle_route(allowed, frozenset({"image", "media"}))
+    allowed.abort.assert_not_called()
+    allowed.continue_.assert_called_once()
+
+
 # === Navigation Tests ===
 @pytest.mark.asyncio
-async def test_wait_for_url():
-    from phantomfetch.engines.browser.cdp import CDPEngine
-
-    engine = CDPEngine(headless=True)
-    engine._browser = AsyncMock()
-    mock_context = AsyncMock()
-    engine._browser.new_context.return_value = mock_context
-    mock_page = AsyncMock()
-    mock_context.new_page.return_value = mock_page
-
-    # Mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {}
-    mock_page.goto.return_value = mock_response
-    mock_page.content.return_value = "<html></html>"
-    mock_context.cookies.return_value = []
+async def test_wait_for_url(make_engine):
+    engine, mock_page = make_engine()
 
     await engine.fetch("http://example.com", wait_for_url="**/succes*")
 
@@ -159,25 +157,13 @@ async def test_wait_for_url():
 
 
 @pytest.mark.asyncio
-async def test_wait_for_url_failure():
-    from phantomfetch.engines.browser.cdp import CDPEngine
-
-    engine = CDPEngine(headless=True)
-    engine._browser = AsyncMock()
-    mock_context = AsyncMock()
-    engine._browser.new_context.return_value = mock_context
-    mock_page = AsyncMock()
-    mock_context.new_page.return_value = mock_page
-
-    # Mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_page.goto.return_value = mock_response
-    mock_page.url = "http://wrong-url.com"
-    mock_page.content.return_value = "<html>Wrong</html>"
-
+async def test_wait_for_url_failure(make_engine):
     # Make wait_for_url raise exception
-    mock_page.wait_for_url.side_effect = Exception("Timeout")
+    engine, _ = make_engine(
+        content="<html>Wrong</html>",
+        url="http://wrong-url.com",
+        wait_for_url_side_effect=Exception("Timeout"),
+    )
 
     resp = await engine.fetch("http://example.com", wait_for_url="**/succes*")
 
@@ -205,11 +191,10 @@ async def test_extract_action():
     assert results[0].success is True
     assert results[0].data == {"title": "Test Product"}
 
-    # Verify JS injection was called
-    mock_page.evaluate.assert_called_once()
-    call_args = mock_page.evaluate.call_args
-    # Check if schema passed in args
-    assert call_args[0][1]["schema"] == {"title": ".title :: text"}
+    # Verify JS injection was called with the schema
+    mock_page.evaluate.assert_called_once_with(
+        ANY, {"rootSelector": ".product", "schema": {"title": ".title :: text"}}
+    )
 
 
 # === Session & HAR Tests ===
@@ -241,16 +226,13 @@ def test_har_export_generation(tmp_path):
     assert os.path.exists(har_path)
 
     # Verify content
-    import json
-
-    with open(har_path) as f:
-        har_data = json.load(f)
+    har = msgspec.json.decode(har_path.read_bytes(), type=HarFile)
 
-    assert har_data["log"]["creator"]["name"] == "PhantomFetch"
-    assert len(har_data["log"]["entries"]) == 1
-    entry = har_data["log"]["entries"][0]
-    assert entry["request"]["url"] == "https://example.com/api"
-    assert entry["time"] == 500.0  # 0.5s * 1000
+    assert har.log.creator.name == "PhantomFetch"
+    assert len(har.log.entries) == 1
+    entry = har.log.entries[0]
+    assert entry.request.url == "https://example.com/api"
+    assert entry.time == 500.0  # 0.5s * 1000
 
 
 @pytest.mark.asyncio
@@ -258,7 +240,7 @@ async def test_session_persistence_logic():
     from phantomfetch.fetch import Fetcher
 
     # Mock engine
-    mock_engine = AsyncMock()
+    mock_engine = Mock(spec=CDPEngine)
     # Mock response with storage state
     mock_response = Response(
         url="http://example.com",
@@ -279,16 +261,18 @@ async def test_session_persistence_logic():
 
     fetcher = Fetcher(headless=True)
     fetcher._browser = mock_engine
+    fetcher._cdp_engine = mock_engine
     fetcher._browser_engine_type = "cdp"
 
     # 1. Fetch triggers session update
     await fetcher.fetch("http://example.com", engine="browser")
 
-    assert fetcher.session_data == mock_response.storage_state
+    # Fetcher keeps the engine's storage state object as-is
+    assert fetcher.session_data is mock_response.storage_state
 
     # 2. Next fetch uses session data
     await fetcher.fetch("http://example.com/2", engine="browser")
 
     # Check if storage_state was passed to engine.fetch
     call_args = mock_engine.fetch.call_args[1]
-    assert call_args["storage_state"] == mock_response.storage_state
+    assert call_args["storage_state"] is mock_response.storage_state
@@ -1,15 +1,43 @@
 """Tests for Fetcher initialization and configuration."""
 
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
 from phantomfetch import Fetcher, FileSystemCache, Proxy
+from phantomfetch.engines import CDPEngine
 from phantomfetch.pool import ProxyPool
 
 
+@pytest.fixture(scope="module")
+def default_fetcher():
+    """Fetcher with default settings, shared by read-only tests."""
+    return Fetcher()
+
+
+@pytest.fixture(scope="module")
+def proxies_fetcher():
+    """Fetcher built from Proxy objects, shared by read-only tests."""
+    return Fetcher(
+        proxies=[
+            Proxy(url="http://proxy1:8080", location="US"),
+            Proxy(url="http://proxy2:8080", location="EU"),
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def shared_pool():
+    """Pool built from proxy URLs, shared by read-only tests."""
+    return ProxyPool(["http://proxy1:8080", "http://proxy2:8080"])
+
+
 class TestFetcherInit:
     """Test Fetcher initialization."""
 
-    def test_fetcher_basic_init(self):
+    def test_fetcher_basic_init(self, default_fetcher):
         """Test basic fetcher initialization."""
-        f = Fetcher()
+        f = default_fetcher
         assert f is not None
         assert f.timeout == 30.0
         assert f.max_retries == 3
@@ -26,13 +54,9 @@ class TestFetcherInit:
         assert isinstance(f.proxy_pool, ProxyPool)
         assert len(f.proxy_pool.proxies) == 2
 
-    def test_fetcher_with_proxy_objects(self):
+    def test_fetcher_with_proxy_objects(self, proxies_fetcher):
         """Test fetcher with Proxy objects."""
-        proxies = [
-            Proxy(url="http://proxy1:8080", location="US"),
-            Proxy(url="http://proxy2:8080", location="EU"),
-        ]
-        f = Fetcher(proxies=proxies)
+        f = proxies_fetcher
         assert len(f.proxy_pool.proxies) == 2
         assert f.proxy_pool.proxies[0].location == "US"
 
@@ -47,12 +71,36 @@ class TestFetcherInit:
         f = Fetcher(cache=False)
         assert f.cache is None
 
-    def test_fetcher_with_custom_cache(self):
+    def test_fetcher_with_custom_cache(self, tmp_path):
         """Test fetcher with custom cache instance."""
-        cache = FileSystemCache(cache_dir=".test_cache")
+        cache = FileSystemCache(cache_dir=tmp_path / "cache")
         f = Fetcher(cache=cache)
         assert f.cache is cache
 
+    def test_fetcher_per_host_limit(self):
+        """Test max_concurrent_per_host is passed to the curl engine."""
+        f = Fetcher(max_concurrent_per_host=4)
+        assert f._curl.max_concurrent_per_host == 4
+
+    @pytest.mark.asyncio
+    async def test_fetcher_exit_closes_curl_pool(self):
+        """Test leaving the context closes pooled curl sessions."""
+        f = Fetcher()
+        f._browser = Mock(spec=CDPEngine)
+        with patch.object(f._curl, "aclose", new=AsyncMock()) as aclose:
+            await f.__aexit__(None, None, None)
+        aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fetcher_stop_closes_curl_pool(self):
+        """Test stop() closes pooled curl sessions like leaving the context."""
+        f = Fetcher()
+        f._browser = Mock(spec=CDPEngine)
+        with patch.object(f._curl, "aclose", new=AsyncMock()) as aclose:
+            await f.stop()
+        f._browser.disconnect.assert_awaited_once()
+        aclose.assert_awaited_once()
+
 
 class TestProxyPool:
     """Test ProxyPool functionality."""
@@ -62,11 +110,10 @@ class TestProxyPool:
         pool = ProxyPool([])
         assert len(pool.proxies) == 0
 
-    def test_proxy_pool_with_strings(self):
+    def test_proxy_pool_with_strings(self, shared_pool):
         """Test proxy pool with string URLs."""
-        pool = ProxyPool(["http://proxy1:8080", "http://proxy2:8080"])
-        assert len(pool.proxies) == 2
-        assert all(isinstance(p, Proxy) for p in pool.proxies)
+        assert len(shared_pool.proxies) == 2
+        assert all(isinstance(p, Proxy) for p in shared_pool.proxies)
 
     def test_proxy_pool_round_robin(self):
         """Test round-robin proxy selection."""
@@ -85,18 +132,46 @@ class TestProxyPool:
         assert p2.url == "http://proxy2:8080"
         assert p3.url == "http://proxy1:8080"  # Wraps around
 
+    def test_proxy_pool_weights_after_fail_open(self):
+        """Test fail-open selection doesn't misalign weights with proxies."""
+        proxies = [
+            Proxy(url="http://proxy1:8080", weight=1, cooldown_until=4e9),
+            Proxy(url="http://proxy2:8080", weight=0, cooldown_until=3e9),
+        ]
+        pool = ProxyPool(proxies, strategy="random")
+
+        # Everything is cooling down, so the soonest-expiring proxy is used
+        assert pool.get().url == "http://proxy2:8080"
+        assert [p.url for p in pool.proxies] == [p.url for p in proxies]
+
+        for p in proxies:
+            p.cooldown_until = 0.0
+        assert all(pool.get().url == "http://proxy1:8080" for _ in range(200))
+
+    def test_proxy_pool_random_respects_weight(self):
+        """Test random selection never picks a zero-weight proxy."""
+        proxies = [
+            Proxy(url="http://proxy1:8080", weight=0),
+            Proxy(url="http://proxy2:8080", weight=1),
+        ]
+        pool = ProxyPool(proxies, strategy="random")
+
+        assert all(pool.get().url == "http://proxy2:8080" for _ in range(20))
+
     def test_proxy_pool_mark_success(self):
         """Test marking proxy as successful."""
-        proxy = Proxy(url="http://proxy:8080")
-        pool = ProxyPool([proxy])
+        pool = ProxyPool(["http://proxy:8080"])
+        [proxy] = pool.proxies
 
+        pool.mark_failed(proxy)
         pool.mark_success(proxy)
         assert proxy.failures == 0  # Resets on success
+        assert pool.get() is proxy
 
     def test_proxy_pool_mark_failed(self):
         """Test marking proxy as failed."""
-        proxy = Proxy(url="http://proxy:8080")
-        pool = ProxyPool([proxy])
+        pool = ProxyPool(["http://proxy:8080"])
+        [proxy] = pool.proxies
 
         initial_failures = proxy.failures
         pool.mark_failed(proxy)
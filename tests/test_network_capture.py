@@ -3,15 +3,22 @@ import pytest
 from phantomfetch import Action, Fetcher
 
 
+@pytest.mark.network
 @pytest.mark.asyncio
 async def test_network_capture():
     # We trigger a fetch inside the browser page
     actions = [
         Action(
             action="evaluate",
-            value="fetch('https://httpbin.org/json').then(r => r.json())",
+            value=(
+                "() => { fetch('https://httpbin.org/json')"
+                ".then(r => r.json()).then(() => { window.__done = true; }); }"
+            ),
+        ),
+        # Continue as soon as the fetch resolves
+        Action(
+            action="wait_for_function", value="window.__done === true", timeout=5000
         ),
-        Action(action="wait", timeout=2000),  # Give it time to complete
     ]
 
     async with Fetcher(browser_engine="cdp") as f:
@@ -31,3 +38,4 @@ async def test_network_capture():
     assert exchange.resource_type == "fetch"
     assert exchange.method == "GET"
     assert exchange.status == 200
+    assert "slideshow" in exchange.parsed_body
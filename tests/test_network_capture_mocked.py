@@ -0,0 +1,43 @@
+"""Offline variant of test_network_capture, driving the capture handler directly."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_network_capture_mocked(make_engine):
+    engine, mock_page = make_engine()
+
+    request = Mock(
+        resource_type="fetch",
+        method="GET",
+        timing={"requestStart": 10.0, "responseEnd": 60.0},
+        post_data=None,
+    )
+    request.all_headers = AsyncMock(return_value={"accept": "application/json"})
+    xhr = Mock(url="https://httpbin.org/json", status=200, request=request)
+    xhr.body = AsyncMock(return_value=b'{"slideshow": {"title": "Sample"}}')
+    xhr.all_headers = AsyncMock(return_value={"content-type": "application/json"})
+
+    navigation = mock_page.goto.return_value
+
+    async def goto(url, **kwargs):
+        # Fire the "response" listener the engine registered, as the page would
+        on_response = mock_page.on.call_args[0][1]
+        await on_response(xhr)
+        return navigation
+
+    mock_page.goto.side_effect = goto
+
+    resp = await engine.fetch("https://httpbin.org/html")
+
+    assert resp.ok
+    assert len(resp.network_log) == 1
+    exchange = resp.network_log[0]
+    assert exchange.url == "https://httpbin.org/json"
+    assert exchange.resource_type == "fetch"
+    assert exchange.method == "GET"
+    assert exchange.status == 200
+    assert exchange.duration == pytest.approx(0.05)
+    assert exchange.parsed_body == {"slideshow": {"title": "Sample"}}
@@ -0,0 +1,39 @@
+"""Tests for the tracing helpers."""
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+from phantomfetch import telemetry
+from phantomfetch.telemetry import start_span, tracing_enabled
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """Forget any cached provider check for the duration of a test."""
+    monkeypatch.setattr(telemetry._TracingState, "enabled", False)
+
+
+def test_start_span_noop_without_provider(monkeypatch, fresh_state):
+    """Test spans are skipped while only the proxy provider is installed."""
+    monkeypatch.setattr(trace, "get_tracer_provider", trace.ProxyTracerProvider)
+
+    assert tracing_enabled() is False
+    with start_span(trace.get_tracer("test"), "noop") as span:
+        assert span is trace.INVALID_SPAN
+        assert not span.is_recording()
+
+
+def test_start_span_records_with_provider(monkeypatch, fresh_state):
+    """Test spans are real once an SDK provider is installed, and stay enabled."""
+    provider = TracerProvider()
+    monkeypatch.setattr(trace, "get_tracer_provider", lambda: provider)
+
+    assert tracing_enabled() is True
+    with start_span(provider.get_tracer("test"), "real") as span:
+        assert span.is_recording()
+        assert span.name == "real"
+
+    # A positive result is cached; the provider is not consulted again
+    monkeypatch.setattr(trace, "get_tracer_provider", trace.ProxyTracerProvider)
+    assert tracing_enabled() is True
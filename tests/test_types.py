@@ -1,5 +1,7 @@
 """Tests for Response type and basic functionality."""
 
+import pytest
+
 from phantomfetch import Cookie, Response
 from phantomfetch.types import Action, NetworkExchange
 
@@ -7,10 +9,14 @@ from phantomfetch.types import Action, NetworkExchange
 class TestResponse:
     """Test Response object functionality."""
 
-    def test_response_ok_property(self):
+    @pytest.fixture
+    def ok_response(self):
+        """Plain successful response."""
+        return Response(url="https://example.com", status=200, body=b"test")
+
+    def test_response_ok_property(self, ok_response):
         """Test ok property for successful responses."""
-        resp = Response(url="https://example.com", status=200, body=b"test")
-        assert resp.ok is True
+        assert ok_response.ok is True
 
         resp_error = Response(
             url="https://example.com", status=500, body=b"error", error="Server error"
@@ -22,33 +28,26 @@ class TestResponse:
         resp = Response(url="https://example.com", status=200, body=b"Hello World")
         assert resp.text == "Hello World"
 
-    def test_response_json(self):
-        """Test json method parses JSON body."""
-        json_body = b'{"key": "value", "number": 42}'
-        resp = Response(url="https://example.com", status=200, body=json_body)
-        data = resp.json()
-        assert data["key"] == "value"
-        assert data["number"] == 42
-
-    def test_response_json_empty_body(self):
-        """Test json method with empty body returns None."""
-        resp = Response(url="https://example.com", status=200, body=b"")
-        assert resp.json() is None
-
-    def test_response_json_with_null_bytes(self):
-        """Test json method strips null bytes."""
-        json_body = b'{"key": "value\x00"}'
-        resp = Response(url="https://example.com", status=200, body=json_body)
-        data = resp.json()
-        assert data["key"] == "value"
-
-    def test_response_from_cache_flag(self):
+    @pytest.mark.parametrize(
+        ("body", "expected"),
+        [
+            (b'{"key": "value", "number": 42}', {"key": "value", "number": 42}),
+            (b"", None),
+            (b'{"key": "value\x00"}', {"key": "value"}),
+        ],
+        ids=["object", "empty_body", "null_bytes"],
+    )
+    def test_response_json(self, body, expected):
+        """Test json parses the body, strips null bytes, and maps empty to None."""
+        resp = Response(url="https://example.com", status=200, body=body)
+        assert resp.json() == expected
+
+    def test_response_from_cache_flag(self, ok_response):
         """Test from_cache flag."""
-        resp = Response(url="https://example.com", status=200, body=b"test")
-        assert resp.from_cache is False
+        assert ok_response.from_cache is False
 
-        resp.from_cache = True
-        assert resp.from_cache is True
+        ok_response.from_cache = True
+        assert ok_response.from_cache is True
 
 
 class TestCookie:
@@ -82,6 +81,14 @@ class TestCookie:
         assert cookie.secure is True
         assert cookie.same_site == "Strict"
 
+    def test_cookie_is_hashable(self):
+        """Test frozen cookies can be deduplicated in a set."""
+        cookies = {
+            Cookie(name="session", value="abc123"),
+            Cookie(name="session", value="abc123"),
+        }
+        assert len(cookies) == 1
+
 
 class TestAction:
     """Test Action type."""
@@ -121,3 +128,27 @@ class TestNetworkExchange:
         assert exchange.status == 200
         assert exchange.resource_type == "xhr"
         assert exchange.duration == 0.5
+
+    def test_network_exchange_parsed_body(self):
+        """Test parsed_body decodes JSON responses only."""
+        exchange = NetworkExchange(
+            url="https://api.example.com/data",
+            method="GET",
+            status=200,
+            resource_type="xhr",
+            request_headers={},
+            response_headers={"content-type": "application/json; charset=utf-8"},
+            response_body='{"result": "success"}',
+        )
+        assert exchange.parsed_body == {"result": "success"}
+
+        html = NetworkExchange(
+            url="https://example.com",
+            method="GET",
+            status=200,
+            resource_type="document",
+            request_headers={},
+            response_headers={"content-type": "text/html"},
+            response_body="<html></html>",
+        )
+        assert html.parsed_body is None